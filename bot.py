@@ -3,16 +3,27 @@ Optimized Telegram bot for AI Research Agent
 Bug fixes and enhanced UI/UX with countdown and better error handling
 """
 import os
+import re
+import time
+import random
 import asyncio
 import html
 import logging
-from typing import Dict, List, Optional, Tuple
+import threading
+import weakref
+import itertools
+from collections import deque
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Deque, Dict, Optional, Tuple
 from functools import lru_cache
+import requests
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from research_agent import AIResearchAgent
+from research_agent import AIResearchAgent, create_parse_pool, create_session
 
 # Configure logging
 logging.basicConfig(
@@ -23,7 +34,7 @@ logger = logging.getLogger(__name__)
 
 try:
     from telegram import Update, constants, InlineKeyboardButton, InlineKeyboardMarkup
-    from telegram.error import BadRequest, TimedOut, NetworkError, TelegramError
+    from telegram.error import BadRequest, TimedOut, NetworkError, TelegramError, RetryAfter
     from telegram.ext import (
         ApplicationBuilder,
         CommandHandler,
@@ -32,19 +43,43 @@ try:
         CallbackQueryHandler,
         filters,
     )
+    from telegram.request import HTTPXRequest
 except ImportError as e:
     raise SystemExit(
         "python-telegram-bot required. Install: pip install python-telegram-bot"
     ) from e
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; PTB falls back to stdlib json
+    orjson = None
+
 # Constants
 MAX_MESSAGE_LEN = 3800  # Reduced for safety margin
 DEFAULT_SOURCES = 3
 ANALYSIS_MAX_LEN = 1000
 CACHE_SIZE = 128
-COUNTDOWN_SECONDS = 5
+STATUS_EDIT_DELAY = 2  # Seconds before the single "processing" status edit
 MIN_SEARCH_DELAY = 1  # Minimum delay to avoid rate limits
 
+# Telegram flood limits: ~30 msg/s bot-wide, ~1 msg/s per chat (short bursts ok)
+GLOBAL_RATE_LIMIT = 30
+GLOBAL_RATE_PERIOD = 1.0
+CHAT_RATE_LIMIT = 3
+CHAT_RATE_PERIOD = 3.0
+MAX_SEND_ATTEMPTS = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 60.0  # Never wait longer than this before retrying a send
+RESEARCH_WORKERS = 8  # Threads doing blocking search/scrape work
+PREFETCH_WORKERS = 2  # Next pages loaded ahead of time at once; more are skipped, not queued
+PARSE_PROCESSES = min(4, os.cpu_count() or 1)  # Processes parsing scraped HTML
+MAX_PENDING_RESEARCH = 16  # Research calls admitted at once; the rest wait
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_TTL = 15  # Seconds a finished search is reused for repeat clicks
+USER_STATE_TTL = 24 * 3600  # Drop state of users idle longer than this
+USER_STATE_SWEEP_INTERVAL = 3600
+PAGINATION_DEBOUNCE = 0.15  # Rapid page clicks within this window collapse to the last
+
 # UI Emojis
 EMOJI = {
     'search': '🔍',
@@ -67,8 +102,150 @@ EMOJI = {
     'rocket': '🚀',
 }
 
-# Agent cache
-_agent_cache: Dict[str, AIResearchAgent] = {}
+# Pools and the shared session are created by start_resources() in main(), not at import:
+# spawned parse workers re-import this module and must not build their own copies
+# Dedicated, bounded pool so slow searches can't exhaust the default executor
+_RESEARCH_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_RESEARCH_SEM = asyncio.Semaphore(MAX_PENDING_RESEARCH)
+# Prefetches get their own small pool so they never hold up a user's query, and a
+# slot per thread so a guess is skipped rather than queued when the pool is busy
+_PREFETCH_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_PREFETCH_SLOTS = threading.BoundedSemaphore(PREFETCH_WORKERS)
+
+# One HTTP session shared by every agent so keep-alive connections are reused
+_SHARED_SESSION: Optional[requests.Session] = None
+
+# HTML parsing is CPU-bound; a process pool keeps it off the GIL shared with the event loop
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+
+# Agents created so far, tracked only so their sessions can be closed on exit
+_live_agents: "weakref.WeakSet[AIResearchAgent]" = weakref.WeakSet()
+
+# Identical searches share one in-flight future and a short-lived result
+_INFLIGHT: Dict[Tuple, asyncio.Future] = {}
+_RESULT_CACHE: Dict[Tuple, Tuple[float, Dict]] = {}
+
+# Latest pagination request per chat; older in-flight page loads are dropped
+_PAGINATION_TOKENS: Dict[int, int] = {}
+_pagination_counter = itertools.count(1)
+
+_eviction_task: Optional["asyncio.Task"] = None
+
+_RETRY_AFTER_RE = re.compile(r'retry after (\d+)', re.I)
+_ERROR_KIND_RE = re.compile(r'rate|limit|quota|timeout|network', re.I)
+
+# User-facing text per error kind (see classify_error)
+RESEARCH_ERROR_TEXT = {
+    'rate': 'Rate limited - please wait',
+    'timeout': 'Search timeout - try again',
+}
+QUERY_ERROR_TEXT = {
+    'rate': "⏳ Rate limited. Please wait a moment and try again.",
+    'timeout': "⏱️ Search timeout. Please try a simpler query.",
+    'network': "🌐 Network error. Please check your connection.",
+}
+
+
+def classify_error(error: Exception) -> Optional[str]:
+    """Classify an error as 'rate', 'timeout' or 'network' in one regex pass"""
+    found = {word.lower() for word in _ERROR_KIND_RE.findall(str(error))}
+    if found & {'rate', 'limit', 'quota'}:
+        return 'rate'
+    if 'timeout' in found:
+        return 'timeout'
+    if 'network' in found:
+        return 'network'
+    return None
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Extract the flood-control delay Telegram asked for, if any"""
+    if isinstance(error, RetryAfter):
+        delay = error.retry_after
+        # Newer PTB releases report a timedelta instead of seconds
+        return float(delay.total_seconds() if hasattr(delay, 'total_seconds') else delay)
+    match = _RETRY_AFTER_RE.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class RateLimiter:
+    """Sliding-window limiter for Telegram's global and per-chat send limits"""
+    
+    def __init__(
+        self,
+        global_limit: int = GLOBAL_RATE_LIMIT,
+        global_period: float = GLOBAL_RATE_PERIOD,
+        chat_limit: int = CHAT_RATE_LIMIT,
+        chat_period: float = CHAT_RATE_PERIOD
+    ):
+        self.global_limit = global_limit
+        self.global_period = global_period
+        self.chat_limit = chat_limit
+        self.chat_period = chat_period
+        self._global: Deque[float] = deque()
+        self._global_lock = asyncio.Lock()
+        self._chats: Dict[int, Deque[float]] = {}
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self._paused_until = 0.0
+    
+    async def _wait_slot(
+        self,
+        window: Deque[float],
+        limit: int,
+        period: float,
+        lock: asyncio.Lock
+    ) -> None:
+        """Block until the window has room, then record this call"""
+        async with lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                while window and now - window[0] >= period:
+                    window.popleft()
+                if len(window) < limit:
+                    window.append(now)
+                    return
+                await asyncio.sleep(period - (now - window[0]))
+    
+    def _prune_chats(self) -> None:
+        """Forget chats with no calls inside the current window"""
+        now = time.monotonic()
+        idle = [
+            chat_id for chat_id, window in self._chats.items()
+            if not window or now - window[-1] >= self.chat_period
+        ]
+        for chat_id in idle:
+            lock = self._chat_locks.get(chat_id)
+            if lock is None or not lock.locked():
+                self._chats.pop(chat_id, None)
+                self._chat_locks.pop(chat_id, None)
+    
+    @asynccontextmanager
+    async def acquire(self, chat_id: Optional[int] = None) -> AsyncIterator[None]:
+        """Reserve a send slot; honours Telegram's retry_after on flood errors"""
+        if chat_id is not None:
+            if len(self._chats) > 1024:
+                self._prune_chats()
+            window = self._chats.setdefault(chat_id, deque())
+            lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+            await self._wait_slot(window, self.chat_limit, self.chat_period, lock)
+        await self._wait_slot(
+            self._global, self.global_limit, self.global_period, self._global_lock
+        )
+        try:
+            yield
+        except TelegramError as e:
+            delay = retry_after_seconds(e)
+            if delay is not None:
+                # Pause every sender, not just this one, until the ban lifts
+                logger.warning(f"Flood control hit, pausing sends for {delay:.0f}s")
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            raise
+
+
+rate_limiter = RateLimiter()
 
 
 class UIText:
@@ -148,29 +325,122 @@ class UIText:
         )
 
 
+class OrjsonRequest(HTTPXRequest):
+    """HTTPXRequest that decodes Telegram's JSON responses with orjson"""
+    
+    def parse_json_payload(self, payload: bytes) -> Dict:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # Let PTB handle (and report) malformed or non-UTF-8 payloads
+            return super().parse_json_payload(payload)
+
+
+# Every mode/engine combination, so UI text can be built once at import
+MODES = ('standard', 'news', 'deep')
+ENGINES = ('auto', 'google', 'duckduckgo')
+
+WELCOME_TEXT = UIText.welcome()
+HELP_TEXTS: Dict[Tuple[str, str], str] = {
+    (m, e): UIText.help_text(m, e) for m in MODES for e in ENGINES
+}
+SETTINGS_TEXTS: Dict[Tuple[str, str], str] = {
+    (m, e): UIText.settings(m, e) for m in MODES for e in ENGINES
+}
+
+
+@lru_cache(maxsize=2048)
+def _escape(text: str) -> str:
+    """html.escape, memoized for queries/titles/URLs re-rendered on pagination"""
+    return html.escape(text)
+
+
+@dataclass(slots=True)
+class Prefetch:
+    """A next page loading in the background for one user"""
+    key: Tuple  # run_research cache key of the page
+    future: "asyncio.Future"
+    started: threading.Event  # Set by the pool thread once research is actually running
+
+
+@dataclass(slots=True)
+class UserState:
+    """Per-user settings and pagination state, stored under user_data['state']"""
+    mode: str = 'standard'
+    search_engine: str = 'auto'
+    page: int = 0
+    last_query: str = ''
+    depth: str = 'standard'
+    news: bool = False
+    prefetch: Optional[Prefetch] = None
+    last_seen: float = field(default_factory=time.monotonic)
+
+
 def get_user_defaults(context: ContextTypes.DEFAULT_TYPE) -> Tuple[str, str]:
     """Get user's current mode and search engine with defaults"""
-    mode = context.user_data.get('mode', 'standard')
-    engine = context.user_data.get('search_engine', 'auto')
-    return mode, engine
+    state = init_user_data(context)
+    return state.mode, state.search_engine
 
 
-def init_user_data(context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Initialize user data with defaults"""
-    defaults = {
-        'mode': 'standard',
-        'search_engine': 'auto',
-        'page': 0,
-    }
-    for key, value in defaults.items():
-        if key not in context.user_data:
-            context.user_data[key] = value
+def init_user_data(context: ContextTypes.DEFAULT_TYPE) -> UserState:
+    """Initialize user data with defaults and mark the user as active"""
+    state = context.user_data.get('state')
+    if state is None:
+        state = context.user_data['state'] = UserState()
+    else:
+        state.last_seen = time.monotonic()
+    return state
+
+
+async def evict_idle_users(app) -> None:
+    """Periodically drop state for users idle longer than USER_STATE_TTL"""
+    while True:
+        await asyncio.sleep(USER_STATE_SWEEP_INTERVAL)
+        cutoff = time.monotonic() - USER_STATE_TTL
+        idle = [
+            user_id for user_id, data in app.user_data.items()
+            if data.get('state') is None or data['state'].last_seen < cutoff
+        ]
+        for user_id in idle:
+            app.drop_user_data(user_id)
+        if idle:
+            logger.info(f"Evicted state for {len(idle)} idle user(s)")
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, capped at BACKOFF_CAP"""
+    return min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt + random.uniform(0, 0.5))
+
+
+async def send_with_retry(call, chat_id: Optional[int], action: str):
+    """Run a Telegram API call, retrying on flood control and network errors"""
+    for attempt in range(MAX_SEND_ATTEMPTS):
+        last_attempt = attempt + 1 == MAX_SEND_ATTEMPTS
+        try:
+            async with rate_limiter.acquire(chat_id):
+                return await call()
+        except BadRequest:
+            raise  # Not transient; let the caller decide
+        except (TimedOut, NetworkError) as e:
+            if last_attempt:
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"Network error {action}, retrying in {delay:.1f}s: {e}")
+        except TelegramError as e:
+            delay = retry_after_seconds(e)
+            if delay is None or delay > BACKOFF_CAP or last_attempt:
+                raise
+            logger.warning(f"Flood control {action}, retrying in {delay:.0f}s")
+        await asyncio.sleep(delay)
 
 
 async def safe_edit_message(query, **kwargs) -> bool:
     """Safely edit message with comprehensive error handling"""
+    chat_id = query.message.chat_id if query.message else None
     try:
-        await query.edit_message_text(**kwargs)
+        await send_with_retry(
+            lambda: query.edit_message_text(**kwargs), chat_id, "editing message"
+        )
         return True
     except BadRequest as e:
         error_str = str(e)
@@ -192,61 +462,72 @@ async def safe_edit_message(query, **kwargs) -> bool:
 async def safe_delete_message(bot, chat_id: int, message_id: int) -> bool:
     """Safely delete a message"""
     try:
-        await bot.delete_message(chat_id=chat_id, message_id=message_id)
+        await send_with_retry(
+            lambda: bot.delete_message(chat_id=chat_id, message_id=message_id),
+            chat_id,
+            "deleting message"
+        )
         return True
     except Exception as e:
         logger.debug(f"Could not delete message: {e}")
         return False
 
 
+async def answer_callback(query, text: Optional[str] = None, show_alert: bool = False) -> bool:
+    """Answer a callback query through the rate limiter"""
+    try:
+        async with rate_limiter.acquire():
+            await query.answer(text, show_alert=show_alert)
+        return True
+    except TelegramError as e:
+        logger.debug(f"Could not answer callback: {e}")
+        return False
+
+
 def format_results(data: Dict) -> str:
     """Format research results with enhanced readability"""
-    parts: List[str] = []
+    warning = EMOJI['warning']
+    divider = "━━━━━━━━━━━━━━━━━━━━"
     
     # Header
-    query = html.escape(data.get('query', ''))
+    query = _escape(data.get('query', ''))
     page = int(data.get('page', 0)) + 1
-    
-    parts.append(f"{EMOJI['search']} <b>Search Results</b>")
-    parts.append(f"<b>Query:</b> <code>{query}</code>")
-    
-    if page > 1:
-        parts.append(f"<b>Page:</b> {page}")
-    
-    parts.append("\n━━━━━━━━━━━━━━━━━━━━")
+    page_line = f"\n<b>Page:</b> {page}" if page > 1 else ""
+    header = (
+        f"{EMOJI['search']} <b>Search Results</b>\n"
+        f"<b>Query:</b> <code>{query}</code>{page_line}\n\n{divider}"
+    )
     
     # Results
     results = data.get('search_results', [])
     if results:
-        parts.append(f"\n🔗 <b>Found {len(results)} results:</b>\n")
-        for i, r in enumerate(results, 1):
-            title = html.escape(r.get('title', 'Untitled')[:100])  # Truncate long titles
-            url = html.escape(r.get('url', ''))
-            # Clean display
-            parts.append(f"{i}. <a href=\"{url}\">{title}</a>")
+        links = "\n".join(
+            f"{i}. <a href=\"{_escape(r.get('url', ''))}\">"
+            f"{_escape(r.get('title', 'Untitled')[:100])}</a>"  # Truncate long titles
+            for i, r in enumerate(results, 1)
+        )
+        results_block = f"\n\n🔗 <b>Found {len(results)} results:</b>\n\n{links}"
     else:
-        parts.append(f"\n{EMOJI['warning']} <b>No results found</b>")
+        results_block = f"\n\n{warning} <b>No results found</b>"
     
     # Sources
     sources = data.get('sources', [])
-    if sources:
-        parts.append(f"\n📄 <b>Analyzed:</b> {len(sources)} source(s)")
+    sources_block = f"\n\n📄 <b>Analyzed:</b> {len(sources)} source(s)" if sources else ""
     
     # AI Analysis
     analysis = data.get('analysis')
+    analysis_block = ""
     if analysis:
-        parts.append("\n━━━━━━━━━━━━━━━━━━━━")
         text = html.escape(analysis.strip())
         if len(text) > ANALYSIS_MAX_LEN:
             text = text[:ANALYSIS_MAX_LEN].rsplit(' ', 1)[0] + "…"
-        parts.append(f"\n{EMOJI['deep']} <b>AI Analysis:</b>\n\n{text}")
+        analysis_block = f"\n\n{divider}\n\n{EMOJI['deep']} <b>AI Analysis:</b>\n\n{text}"
     
     # Error/Warning
     error = data.get('error')
-    if error:
-        parts.append(f"\n\n{EMOJI['warning']} <i>{html.escape(str(error)[:200])}</i>")
+    error_block = f"\n\n\n{warning} <i>{html.escape(str(error)[:200])}</i>" if error else ""
     
-    msg = "\n".join(parts)
+    msg = f"{header}{results_block}{sources_block}{analysis_block}{error_block}"
     
     # Final length check
     if len(msg) > MAX_MESSAGE_LEN:
@@ -256,40 +537,42 @@ def format_results(data: Dict) -> str:
 
 
 @lru_cache(maxsize=CACHE_SIZE)
+def _create_agent(use_ai: bool, search_engine: str) -> AIResearchAgent:
+    """Create an agent; lru_cache keeps one per (use_ai, engine) pair"""
+    logger.info(f"Creating new agent: {use_ai}_{search_engine}")
+    agent = AIResearchAgent(
+        use_ai=use_ai,
+        ai_backend="ollama",
+        search_engine=search_engine,
+        session=_SHARED_SESSION,
+        parse_executor=_PARSE_POOL
+    )
+    _live_agents.add(agent)
+    return agent
+
+
 def get_agent(use_ai: bool, search_engine: str) -> AIResearchAgent:
     """Get or create cached agent instance"""
-    cache_key = f"{use_ai}_{search_engine}"
-    
-    if cache_key not in _agent_cache:
-        logger.info(f"Creating new agent: {cache_key}")
-        _agent_cache[cache_key] = AIResearchAgent(
-            use_ai=use_ai,
-            ai_backend="ollama",
-            search_engine=search_engine
-        )
-    
-    agent = _agent_cache[cache_key]
-    agent.set_search_engine(search_engine)
-    return agent
+    # Normalize so equivalent arguments share one cache entry
+    return _create_agent(bool(use_ai), (search_engine or 'auto').lower())
 
 
-async def run_research(
+def _research_call(
     query: str,
     depth: str,
     news: bool,
     sources: int,
     page: int,
     search_engine: str
-) -> Dict:
-    """Execute research in thread pool with proper error handling"""
-    loop = asyncio.get_running_loop()
+) -> Callable[[], Dict]:
+    """Blocking research call for a pool thread; errors come back as result dicts"""
     use_ai = (depth == 'deep')
     
     try:
         agent = get_agent(use_ai, search_engine)
     except Exception as e:
         logger.error(f"Failed to get agent: {e}")
-        return {
+        failed = {
             'query': query,
             'error': 'Service initialization failed',
             'search_results': [],
@@ -297,6 +580,7 @@ async def run_research(
             'page': page,
             'has_more': False
         }
+        return lambda: failed
     
     def _execute() -> Dict:
         try:
@@ -310,13 +594,7 @@ async def run_research(
             )
         except Exception as e:
             logger.error(f"Research error for '{query}': {e}", exc_info=True)
-            error_msg = str(e)
-            if 'rate' in error_msg.lower() or 'limit' in error_msg.lower():
-                error_msg = 'Rate limited - please wait'
-            elif 'timeout' in error_msg.lower():
-                error_msg = 'Search timeout - try again'
-            else:
-                error_msg = 'Search failed'
+            error_msg = RESEARCH_ERROR_TEXT.get(classify_error(e), 'Search failed')
             
             return {
                 'query': query,
@@ -327,7 +605,119 @@ async def run_research(
                 'has_more': False
             }
     
-    return await loop.run_in_executor(None, _execute)
+    return _execute
+
+
+async def _execute_research(
+    query: str,
+    depth: str,
+    news: bool,
+    sources: int,
+    page: int,
+    search_engine: str
+) -> Dict:
+    """Execute research in thread pool with proper error handling"""
+    loop = asyncio.get_running_loop()
+    execute = _research_call(query, depth, news, sources, page, search_engine)
+    async with _RESEARCH_SEM:
+        return await loop.run_in_executor(_RESEARCH_EXECUTOR, execute)
+
+
+def _cache_result(key: Tuple, data: Dict) -> None:
+    """Store a result in the short-lived cache, evicting expired/oldest entries"""
+    now = time.monotonic()
+    for stale in [k for k, (expires, _) in _RESULT_CACHE.items() if expires <= now]:
+        del _RESULT_CACHE[stale]
+    while len(_RESULT_CACHE) >= RESULT_CACHE_SIZE:
+        del _RESULT_CACHE[next(iter(_RESULT_CACHE))]
+    _RESULT_CACHE[key] = (now + RESULT_CACHE_TTL, data)
+
+
+async def run_research(
+    query: str,
+    depth: str,
+    news: bool,
+    sources: int,
+    page: int,
+    search_engine: str
+) -> Dict:
+    """Run research, sharing identical in-flight or recent requests"""
+    key = (query, depth, news, sources, page, search_engine)
+    
+    cached = _RESULT_CACHE.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    future = _INFLIGHT.get(key)
+    if future is None:
+        future = asyncio.ensure_future(
+            _execute_research(query, depth, news, sources, page, search_engine)
+        )
+        _INFLIGHT[key] = future
+        
+        def _done(fut: asyncio.Future) -> None:
+            _INFLIGHT.pop(key, None)
+            if not fut.cancelled() and fut.exception() is None and not fut.result().get('error'):
+                _cache_result(key, fut.result())
+        
+        future.add_done_callback(_done)
+    
+    # shield() so one caller giving up doesn't cancel the search for the others
+    return await asyncio.shield(future)
+
+
+def cancel_prefetch(state: UserState) -> None:
+    """Drop the user's pending prefetch; one already running finishes on its thread"""
+    prefetch, state.prefetch = state.prefetch, None
+    if prefetch is not None:
+        prefetch.future.cancel()
+
+
+def schedule_prefetch(
+    state: UserState,
+    query: str,
+    depth: str,
+    news: bool,
+    page: int,
+    search_engine: str
+) -> None:
+    """Start loading `page` in the background while the user reads the previous one
+    
+    The agent reuses the previous page's search results, so this only scrapes. Prefetches
+    stay out of _INFLIGHT so a user's own request never ends up waiting behind one.
+    """
+    cancel_prefetch(state)
+    if depth == 'deep':
+        return  # Don't spend AI analysis on pages that may never be opened
+    key = (query, depth, news, DEFAULT_SOURCES, page, search_engine)
+    cached = _RESULT_CACHE.get(key)
+    if key in _INFLIGHT or (cached and cached[0] > time.monotonic()):
+        return
+    if not _PREFETCH_SLOTS.acquire(blocking=False):
+        return  # Every prefetch thread is busy; skip this guess rather than queue it
+    
+    execute = _research_call(query, depth, news, DEFAULT_SOURCES, page, search_engine)
+    started = threading.Event()
+    
+    def _run() -> Dict:
+        started.set()
+        return execute()
+    
+    try:
+        job = _PREFETCH_EXECUTOR.submit(_run)
+    except RuntimeError:  # Pool already shut down
+        _PREFETCH_SLOTS.release()
+        return
+    # Runs once the job finishes, or at once if it's cancelled before starting
+    job.add_done_callback(lambda _: _PREFETCH_SLOTS.release())
+    future = asyncio.wrap_future(job)
+    
+    def _done(fut: asyncio.Future) -> None:
+        if not fut.cancelled() and fut.exception() is None and not fut.result().get('error'):
+            _cache_result(key, fut.result())
+    
+    future.add_done_callback(_done)
+    state.prefetch = Prefetch(key=key, future=future, started=started)
 
 
 async def countdown_status(
@@ -336,53 +726,37 @@ async def countdown_status(
     message_id: int,
     query_text: str,
     mode_emoji: str,
-    seconds: int = COUNTDOWN_SECONDS
+    research_task: "asyncio.Task",
+    delay: float = STATUS_EDIT_DELAY
 ) -> None:
-    """Update status message with animated countdown"""
-    animation = ['⣾', '⣽', '⣻', '⢿', '⡿', '⣟', '⣯', '⣷']
+    """Edit the status message once if research outlasts the initial notice"""
+    try:
+        # shield() so the timeout doesn't cancel the research itself
+        await asyncio.wait_for(asyncio.shield(research_task), timeout=delay)
+        return
+    except asyncio.TimeoutError:
+        pass
+    except Exception:
+        return  # Research failed; the caller reports it
     
-    for i in range(seconds, 0, -1):
-        try:
-            spinner = animation[i % len(animation)]
+    try:
+        async with rate_limiter.acquire(chat_id):
             await bot.edit_message_text(
                 chat_id=chat_id,
                 message_id=message_id,
                 text=(
                     f"{mode_emoji} <b>Searching...</b>\n\n"
-                    f"<code>{html.escape(query_text[:50])}</code>\n\n"
-                    f"{spinner} <b>Please wait {i}s</b>"
+                    f"<code>{_escape(query_text[:50])}</code>\n\n"
+                    f"{EMOJI['sparkle']} <b>Processing results...</b>"
                 ),
                 parse_mode=constants.ParseMode.HTML,
             )
-            await asyncio.sleep(1)
-        except (BadRequest, TelegramError) as e:
-            logger.debug(f"Countdown update failed: {e}")
-            break
-    
-    # Final update with sparkle
-    try:
-        await bot.edit_message_text(
-            chat_id=chat_id,
-            message_id=message_id,
-            text=(
-                f"{mode_emoji} <b>Searching...</b>\n\n"
-                f"<code>{html.escape(query_text[:50])}</code>\n\n"
-                f"{EMOJI['sparkle']} <b>Processing results...</b>"
-            ),
-            parse_mode=constants.ParseMode.HTML,
-        )
-    except (BadRequest, TelegramError):
-        pass
+    except (BadRequest, TelegramError) as e:
+        logger.debug(f"Status update failed: {e}")
 
 
-def build_keyboard(
-    mode: str,
-    page: int,
-    has_more: bool,
-    engine: str,
-    context: str = 'results'
-) -> InlineKeyboardMarkup:
-    """Build context-appropriate keyboard with enhanced visual design"""
+def _build_menu_keyboard(mode: str, engine: str, context: str) -> InlineKeyboardMarkup:
+    """Build a static menu keyboard; only called at import to fill the caches"""
     
     def active_mark(current: str, target: str, emoji: str, label: str) -> str:
         """Create button text with active indicator"""
@@ -390,10 +764,6 @@ def build_keyboard(
             return f"● {emoji} {label}"
         return f"○ {emoji} {label}"
     
-    def compact_mark(current: str, target: str, emoji: str) -> str:
-        """Compact button for results page"""
-        return f"[{emoji}]" if current == target else emoji
-    
     # Main menu - single mode selector + utilities
     if context == 'main':
         # Get current mode display
@@ -508,6 +878,39 @@ def build_keyboard(
             ],
         ])
     
+    raise ValueError(f"Unknown keyboard context: {context}")
+
+
+# Menu keyboards only depend on (mode, engine), so build each one once
+_MAIN_KEYBOARDS: Dict[str, InlineKeyboardMarkup] = {
+    m: _build_menu_keyboard(m, 'auto', 'main') for m in MODES
+}
+_CHOOSE_MODE_KEYBOARDS: Dict[str, InlineKeyboardMarkup] = {
+    m: _build_menu_keyboard(m, 'auto', 'choose_mode') for m in MODES
+}
+_SETTINGS_KEYBOARDS: Dict[Tuple[str, str], InlineKeyboardMarkup] = {
+    (m, e): _build_menu_keyboard(m, e, 'settings') for m in MODES for e in ENGINES
+}
+
+
+def build_keyboard(
+    mode: str,
+    page: int,
+    has_more: bool,
+    engine: str,
+    context: str = 'results'
+) -> InlineKeyboardMarkup:
+    """Build context-appropriate keyboard with enhanced visual design"""
+    if context == 'main':
+        return _MAIN_KEYBOARDS.get(mode) or _MAIN_KEYBOARDS['standard']
+    if context == 'choose_mode':
+        return _CHOOSE_MODE_KEYBOARDS.get(mode) or _CHOOSE_MODE_KEYBOARDS['standard']
+    if context == 'settings':
+        return (
+            _SETTINGS_KEYBOARDS.get((mode, engine))
+            or _SETTINGS_KEYBOARDS[('standard', 'auto')]
+        )
+    
     # Results keyboard - compact and functional
     rows = []
     
@@ -555,26 +958,26 @@ def build_keyboard(
 
 async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /start command"""
-    init_user_data(context)
     mode, engine = get_user_defaults(context)
     
-    await update.message.reply_text(
-        text=UIText.welcome(),
-        parse_mode=constants.ParseMode.HTML,
-        reply_markup=build_keyboard(mode, 0, False, engine, 'main'),
-    )
+    async with rate_limiter.acquire(update.effective_chat.id):
+        await update.message.reply_text(
+            text=WELCOME_TEXT,
+            parse_mode=constants.ParseMode.HTML,
+            reply_markup=build_keyboard(mode, 0, False, engine, 'main'),
+        )
 
 
 async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /help command"""
-    init_user_data(context)
     mode, engine = get_user_defaults(context)
     
-    await update.message.reply_text(
-        text=UIText.help_text(mode, engine),
-        parse_mode=constants.ParseMode.HTML,
-        reply_markup=build_keyboard(mode, 0, False, engine, 'main'),
-    )
+    async with rate_limiter.acquire(update.effective_chat.id):
+        await update.message.reply_text(
+            text=HELP_TEXTS[(mode, engine)],
+            parse_mode=constants.ParseMode.HTML,
+            reply_markup=build_keyboard(mode, 0, False, engine, 'main'),
+        )
 
 
 async def handle_query(
@@ -583,15 +986,16 @@ async def handle_query(
     query_text: str
 ) -> None:
     """Process search query with enhanced UX"""
-    init_user_data(context)
-    mode, engine = get_user_defaults(context)
+    state = init_user_data(context)
+    mode, engine = state.mode, state.search_engine
     
     # Validate query
     query_text = query_text.strip()
     if not query_text or len(query_text) < 2:
-        await update.message.reply_text(
-            f"{EMOJI['warning']} Please enter a valid search query (min 2 characters)"
-        )
+        async with rate_limiter.acquire(update.effective_chat.id):
+            await update.message.reply_text(
+                f"{EMOJI['warning']} Please enter a valid search query (min 2 characters)"
+            )
         return
     
     # Determine search parameters
@@ -606,56 +1010,52 @@ async def handle_query(
     emoji = mode_emoji.get(mode, EMOJI['search'])
     
     # Send initial status
-    status_msg = await context.bot.send_message(
-        chat_id=update.effective_chat.id,
-        text=(
-            f"{emoji} <b>Searching...</b>\n\n"
-            f"<code>{html.escape(query_text[:50])}</code>\n\n"
-            f"{EMOJI['loading']} <b>Please wait {COUNTDOWN_SECONDS}s</b>"
-        ),
-        parse_mode=constants.ParseMode.HTML,
-    )
+    async with rate_limiter.acquire(update.effective_chat.id):
+        status_msg = await context.bot.send_message(
+            chat_id=update.effective_chat.id,
+            text=(
+                f"{emoji} <b>Searching...</b>\n\n"
+                f"<code>{_escape(query_text[:50])}</code>\n\n"
+                f"{EMOJI['loading']} <b>Please wait...</b>"
+            ),
+            parse_mode=constants.ParseMode.HTML,
+        )
     
-    countdown_task = None
+    research_task = None
     
     try:
         # Store query for pagination
-        context.user_data.update({
-            'last_query': query_text,
-            'depth': depth,
-            'news': news,
-            'page': 0,
-        })
+        cancel_prefetch(state)
+        state.last_query = query_text
+        state.depth = depth
+        state.news = news
+        state.page = 0
+        # Any page still loading belongs to the previous query
+        _PAGINATION_TOKENS.pop(update.effective_chat.id, None)
         
-        # Start countdown and search concurrently
-        countdown_task = asyncio.create_task(
-            countdown_status(
-                context.bot,
-                update.effective_chat.id,
-                status_msg.message_id,
-                query_text,
-                emoji
+        # Execute search, updating the status only if it runs long
+        research_task = asyncio.create_task(
+            run_research(
+                query=query_text,
+                depth=depth,
+                news=news,
+                sources=DEFAULT_SOURCES,
+                page=0,
+                search_engine=engine
             )
         )
-        
-        # Execute search
-        data = await run_research(
-            query=query_text,
-            depth=depth,
-            news=news,
-            sources=DEFAULT_SOURCES,
-            page=0,
-            search_engine=engine
+        await countdown_status(
+            context.bot,
+            update.effective_chat.id,
+            status_msg.message_id,
+            query_text,
+            emoji,
+            research_task
         )
+        data = await research_task
         
-        # Wait for countdown
-        try:
-            await countdown_task
-        except asyncio.CancelledError:
-            pass
-        
-        # Small delay for smooth UX
-        await asyncio.sleep(0.5)
+        if data.get('has_more') and not data.get('error'):
+            schedule_prefetch(state, query_text, depth, news, 1, engine)
         
         # Format results
         msg = format_results(data)
@@ -663,44 +1063,42 @@ async def handle_query(
         # Delete status and send results
         await safe_delete_message(context.bot, update.effective_chat.id, status_msg.message_id)
         
-        await context.bot.send_message(
-            chat_id=update.effective_chat.id,
-            text=msg,
-            parse_mode=constants.ParseMode.HTML,
-            disable_web_page_preview=False,
-            reply_markup=build_keyboard(
-                mode=mode,
-                page=0,
-                has_more=bool(data.get('has_more')),
-                engine=engine,
-                context='results'
-            ),
-        )
+        async with rate_limiter.acquire(update.effective_chat.id):
+            await context.bot.send_message(
+                chat_id=update.effective_chat.id,
+                text=msg,
+                parse_mode=constants.ParseMode.HTML,
+                disable_web_page_preview=False,
+                reply_markup=build_keyboard(
+                    mode=mode,
+                    page=0,
+                    has_more=bool(data.get('has_more')),
+                    engine=engine,
+                    context='results'
+                ),
+            )
         
     except Exception as e:
         logger.error(f"Query handling error: {e}", exc_info=True)
         
-        # Cancel countdown
-        if countdown_task and not countdown_task.done():
-            countdown_task.cancel()
+        # Cancel pending research
+        if research_task and not research_task.done():
+            research_task.cancel()
         
         # Determine error message
-        error_msg = "Search failed. Please try again."
-        if any(word in str(e).lower() for word in ['rate', 'limit', 'quota']):
-            error_msg = "⏳ Rate limited. Please wait a moment and try again."
-        elif 'timeout' in str(e).lower():
-            error_msg = "⏱️ Search timeout. Please try a simpler query."
-        elif 'network' in str(e).lower():
-            error_msg = "🌐 Network error. Please check your connection."
+        error_msg = QUERY_ERROR_TEXT.get(
+            classify_error(e), "Search failed. Please try again."
+        )
         
         await safe_delete_message(context.bot, update.effective_chat.id, status_msg.message_id)
         
-        await context.bot.send_message(
-            chat_id=update.effective_chat.id,
-            text=f"{EMOJI['error']} <b>Error</b>\n\n{error_msg}",
-            parse_mode=constants.ParseMode.HTML,
-            reply_markup=build_keyboard(mode, 0, False, engine, 'main'),
-        )
+        async with rate_limiter.acquire(update.effective_chat.id):
+            await context.bot.send_message(
+                chat_id=update.effective_chat.id,
+                text=f"{EMOJI['error']} <b>Error</b>\n\n{error_msg}",
+                parse_mode=constants.ParseMode.HTML,
+                reply_markup=build_keyboard(mode, 0, False, engine, 'main'),
+            )
 
 
 async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -710,187 +1108,362 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         await handle_query(update, context, text)
 
 
-async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle button presses with improved feedback"""
-    query = update.callback_query
-    data = query.data
+async def load_page(
+    query,
+    context: ContextTypes.DEFAULT_TYPE,
+    state: UserState,
+    chat_id: int,
+    token: int,
+    page: int,
+    mode: str,
+    engine: str
+) -> None:
+    """Render a results page unless a newer click for this chat supersedes it"""
+    last_query, depth, news = state.last_query, state.depth, state.news
     
-    # Handle noop (non-interactive buttons)
-    if data == 'noop':
-        await query.answer()
+    # Debounce: only the most recent click per chat gets to render
+    await asyncio.sleep(PAGINATION_DEBOUNCE)
+    if _PAGINATION_TOKENS.get(chat_id) != token:
         return
     
-    init_user_data(context)
-    mode, engine = get_user_defaults(context)
+    await safe_edit_message(
+        query,
+        text=f"📄 <b>Loading page {page + 1}...</b>\n\n{EMOJI['loading']} Please wait...",
+        parse_mode=constants.ParseMode.HTML,
+    )
     
-    # Choose mode menu
-    if data == 'choose_mode':
-        await query.answer()
-        mode_display = {
-            'standard': f"{EMOJI['quick']} Quick Search",
-            'news': f"{EMOJI['news']} News Search",
-            'deep': f"{EMOJI['deep']} Deep Research"
-        }
+    try:
+        prefetch, state.prefetch = state.prefetch, None
+        key = (last_query, depth, news, DEFAULT_SOURCES, page, engine)
+        # Only wait on a prefetch that is already running or done; a queued one is dropped
+        if (prefetch and prefetch.key == key and not prefetch.future.cancelled()
+                and (prefetch.started.is_set() or prefetch.future.done())):
+            data_obj = await asyncio.shield(prefetch.future)
+        else:
+            if prefetch:
+                prefetch.future.cancel()
+            data_obj = await run_research(
+                query=last_query,
+                depth=depth,
+                news=news,
+                sources=DEFAULT_SOURCES,
+                page=page,
+                search_engine=engine
+            )
+        
+        if _PAGINATION_TOKENS.get(chat_id) != token:
+            return  # A newer click superseded this one
         
+        if data_obj.get('has_more') and not data_obj.get('error'):
+            schedule_prefetch(state, last_query, depth, news, page + 1, engine)
+        
+        msg = format_results(data_obj)
         await safe_edit_message(
             query,
-            text=(
-                f"🎯 <b>Choose Search Mode</b>\n\n"
-                f"<b>Current:</b> {mode_display.get(mode)}\n\n"
-                "━━━━━━━━━━━━━━━━━━━━\n"
-                "Select your preferred mode:"
-            ),
+            text=msg,
             parse_mode=constants.ParseMode.HTML,
-            reply_markup=build_keyboard(mode, 0, False, engine, 'choose_mode')
+            disable_web_page_preview=False,
+            reply_markup=build_keyboard(
+                mode=mode,
+                page=page,
+                has_more=bool(data_obj.get('has_more')),
+                engine=engine,
+                context='results'
+            )
         )
+    except Exception as e:
+        logger.error(f"Pagination error: {e}")
+        if _PAGINATION_TOKENS.get(chat_id) == token:
+            await safe_edit_message(
+                query,
+                text=f"{EMOJI['error']} <b>Error loading page</b>\n\nPlease try again.",
+                parse_mode=constants.ParseMode.HTML,
+            )
+    finally:
+        if _PAGINATION_TOKENS.get(chat_id) == token:
+            del _PAGINATION_TOKENS[chat_id]
+
+
+async def _on_noop(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    state: UserState,
+    arg: str
+) -> None:
+    """Non-interactive buttons (dividers, page indicator)"""
+    await answer_callback(update.callback_query)
+
+
+async def _on_choose_mode(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    state: UserState,
+    arg: str
+) -> None:
+    """Choose mode menu"""
+    query = update.callback_query
+    mode, engine = state.mode, state.search_engine
+    await answer_callback(query)
+    mode_display = {
+        'standard': f"{EMOJI['quick']} Quick Search",
+        'news': f"{EMOJI['news']} News Search",
+        'deep': f"{EMOJI['deep']} Deep Research"
+    }
+    
+    await safe_edit_message(
+        query,
+        text=(
+            f"🎯 <b>Choose Search Mode</b>\n\n"
+            f"<b>Current:</b> {mode_display.get(mode)}\n\n"
+            "━━━━━━━━━━━━━━━━━━━━\n"
+            "Select your preferred mode:"
+        ),
+        parse_mode=constants.ParseMode.HTML,
+        reply_markup=build_keyboard(mode, 0, False, engine, 'choose_mode')
+    )
+
+
+async def _on_settings(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    state: UserState,
+    arg: str
+) -> None:
+    """Settings menu"""
+    query = update.callback_query
+    mode, engine = state.mode, state.search_engine
+    await answer_callback(query)
+    await safe_edit_message(
+        query,
+        text=SETTINGS_TEXTS[(mode, engine)],
+        parse_mode=constants.ParseMode.HTML,
+        reply_markup=build_keyboard(mode, 0, False, engine, 'settings')
+    )
+
+
+async def _on_back_to_main(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    state: UserState,
+    arg: str
+) -> None:
+    """Back to main menu"""
+    query = update.callback_query
+    mode, engine = state.mode, state.search_engine
+    await answer_callback(query)
+    await safe_edit_message(
+        query,
+        text=WELCOME_TEXT,
+        parse_mode=constants.ParseMode.HTML,
+        reply_markup=build_keyboard(mode, 0, False, engine, 'main')
+    )
+
+
+async def _on_help(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    state: UserState,
+    arg: str
+) -> None:
+    """Help screen"""
+    query = update.callback_query
+    mode, engine = state.mode, state.search_engine
+    await answer_callback(query)
+    await safe_edit_message(
+        query,
+        text=HELP_TEXTS[(mode, engine)],
+        parse_mode=constants.ParseMode.HTML,
+        reply_markup=build_keyboard(mode, 0, False, engine, 'main')
+    )
+
+
+async def _on_set_mode(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    state: UserState,
+    new_mode: str
+) -> None:
+    """Mode selection (callback data 'mode_<mode>')"""
+    query = update.callback_query
+    if new_mode not in MODES:
+        await answer_callback(query)
         return
+    old_mode = state.mode
+    state.mode = new_mode
     
-    # Settings menu
-    if data == 'show_settings':
-        await query.answer()
-        await safe_edit_message(
+    mode_names = {
+        'standard': f"{EMOJI['quick']} Quick Search",
+        'news': f"{EMOJI['news']} News Search",
+        'deep': f"{EMOJI['deep']} Deep Research"
+    }
+    
+    # If mode actually changed, show confirmation and return to main
+    if new_mode != old_mode:
+        await answer_callback(
             query,
-            text=UIText.settings(mode, engine),
-            parse_mode=constants.ParseMode.HTML,
-            reply_markup=build_keyboard(mode, 0, False, engine, 'settings')
+            f"{EMOJI['success']} {mode_names.get(new_mode, new_mode)} activated!",
+            show_alert=False
         )
-        return
-    
-    # Back to main
-    if data == 'back_to_main':
-        await query.answer()
+        
+        # Return to main menu to show updated mode
         await safe_edit_message(
             query,
-            text=UIText.welcome(),
+            text=WELCOME_TEXT,
             parse_mode=constants.ParseMode.HTML,
-            reply_markup=build_keyboard(mode, 0, False, engine, 'main')
+            reply_markup=build_keyboard(new_mode, 0, False, state.search_engine, 'main')
         )
+    else:
+        await answer_callback(
+            query,
+            f"Already in {mode_names.get(new_mode, new_mode)} mode",
+            show_alert=False
+        )
+
+
+async def _on_set_engine(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    state: UserState,
+    new_engine: str
+) -> None:
+    """Engine selection (callback data 'engine_<engine>')"""
+    query = update.callback_query
+    if new_engine not in ENGINES:
+        await answer_callback(query)
         return
+    state.search_engine = new_engine
     
-    # Help
-    if data == 'help':
-        await query.answer()
-        await safe_edit_message(
+    engine_names = {
+        'auto': f"{EMOJI['auto']} Auto",
+        'google': f"{EMOJI['google']} Google",
+        'duckduckgo': f"{EMOJI['ddg']} DuckDuckGo"
+    }
+    
+    await answer_callback(
+        query,
+        f"{EMOJI['success']} {engine_names.get(new_engine, new_engine)} selected!",
+        show_alert=False
+    )
+
+
+async def _on_page(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    state: UserState,
+    direction: str
+) -> None:
+    """Pagination (callback data 'page_next' / 'page_prev')"""
+    query = update.callback_query
+    last_query = state.last_query
+    if not last_query:
+        await answer_callback(
             query,
-            text=UIText.help_text(mode, engine),
-            parse_mode=constants.ParseMode.HTML,
-            reply_markup=build_keyboard(mode, 0, False, engine, 'main')
+            f"{EMOJI['warning']} Send a search query first!",
+            show_alert=True
         )
         return
     
-    # Mode selection
-    if data.startswith('mode_'):
-        new_mode = data.replace('mode_', '')
-        old_mode = context.user_data.get('mode', 'standard')
-        context.user_data['mode'] = new_mode
-        
-        mode_names = {
-            'standard': f"{EMOJI['quick']} Quick Search",
-            'news': f"{EMOJI['news']} News Search",
-            'deep': f"{EMOJI['deep']} Deep Research"
-        }
-        
-        # If mode actually changed, show confirmation and return to main
-        if new_mode != old_mode:
-            await query.answer(
-                f"{EMOJI['success']} {mode_names.get(new_mode, new_mode)} activated!",
-                show_alert=False
-            )
-            
-            # Return to main menu to show updated mode
-            await safe_edit_message(
-                query,
-                text=UIText.welcome(),
-                parse_mode=constants.ParseMode.HTML,
-                reply_markup=build_keyboard(new_mode, 0, False, engine, 'main')
-            )
-        else:
-            await query.answer(
-                f"Already in {mode_names.get(new_mode, new_mode)} mode",
-                show_alert=False
-            )
+    page = state.page
+    old_page = page
+    page = page + 1 if direction == 'page_next' else max(0, page - 1)
+    
+    # Don't go back if already at page 0
+    if old_page == 0 and direction == 'page_prev':
+        await answer_callback(query, f"{EMOJI['warning']} Already at first page!")
         return
     
-    # Engine selection
-    if data.startswith('engine_'):
-        new_engine = data.replace('engine_', '')
-        context.user_data['search_engine'] = new_engine
-        
-        engine_names = {
-            'auto': f"{EMOJI['auto']} Auto",
-            'google': f"{EMOJI['google']} Google",
-            'duckduckgo': f"{EMOJI['ddg']} DuckDuckGo"
-        }
-        
-        await query.answer(
-            f"{EMOJI['success']} {engine_names.get(new_engine, new_engine)} selected!",
-            show_alert=False
-        )
+    state.page = page
+    
+    # Answer now; the page itself loads in the background
+    await answer_callback(query)
+    
+    chat_id = update.effective_chat.id
+    token = next(_pagination_counter)
+    _PAGINATION_TOKENS[chat_id] = token
+    context.application.create_task(
+        load_page(query, context, state, chat_id, token, page, state.mode, state.search_engine),
+        update=update
+    )
+
+
+# Callback data -> handler; 'mode_*' / 'engine_*' are dispatched on their prefix
+_CALLBACK_HANDLERS = {
+    'noop': _on_noop,
+    'choose_mode': _on_choose_mode,
+    'show_settings': _on_settings,
+    'back_to_main': _on_back_to_main,
+    'help': _on_help,
+    'page_next': _on_page,
+    'page_prev': _on_page,
+}
+_CALLBACK_PREFIX_HANDLERS = {
+    'mode': _on_set_mode,
+    'engine': _on_set_engine,
+}
+
+
+async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle button presses with improved feedback"""
+    query = update.callback_query
+    data = query.data or ''
+    
+    handler = _CALLBACK_HANDLERS.get(data)
+    arg = data
+    if handler is None:
+        prefix, _, arg = data.partition('_')
+        handler = _CALLBACK_PREFIX_HANDLERS.get(prefix)
+    if handler is None:
+        await answer_callback(query)  # Stale or unknown button
         return
     
-    # Pagination
-    if data in ('page_next', 'page_prev'):
-        last_query = context.user_data.get('last_query')
-        if not last_query:
-            await query.answer(
-                f"{EMOJI['warning']} Send a search query first!",
-                show_alert=True
-            )
-            return
-        
-        page = int(context.user_data.get('page', 0))
-        old_page = page
-        page = page + 1 if data == 'page_next' else max(0, page - 1)
-        
-        # Don't go back if already at page 0
-        if old_page == 0 and data == 'page_prev':
-            await query.answer(f"{EMOJI['warning']} Already at first page!", show_alert=False)
-            return
-        
-        context.user_data['page'] = page
-        
-        depth = context.user_data.get('depth', 'standard')
-        news = context.user_data.get('news', False)
-        
-        # Show loading
-        await query.answer()
-        await safe_edit_message(
-            query,
-            text=f"📄 <b>Loading page {page + 1}...</b>\n\n{EMOJI['loading']} Please wait...",
-            parse_mode=constants.ParseMode.HTML,
-        )
-        
+    await handler(update, context, init_user_data(context), arg)
+
+
+def start_resources() -> None:
+    """Create the research pools and the shared HTTP session"""
+    global _RESEARCH_EXECUTOR, _PREFETCH_EXECUTOR, _SHARED_SESSION, _PARSE_POOL
+    _RESEARCH_EXECUTOR = ThreadPoolExecutor(
+        max_workers=RESEARCH_WORKERS, thread_name_prefix="research"
+    )
+    _PREFETCH_EXECUTOR = ThreadPoolExecutor(
+        max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch"
+    )
+    _SHARED_SESSION = create_session()
+    _PARSE_POOL = create_parse_pool(PARSE_PROCESSES)
+
+
+def stop_resources() -> None:
+    """Shut down the research pools without waiting; safe to call more than once"""
+    for pool in (_RESEARCH_EXECUTOR, _PREFETCH_EXECUTOR, _PARSE_POOL):
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def close_agents() -> None:
+    """Close HTTP sessions held by cached agents; safe to call more than once"""
+    for agent in list(_live_agents):
         try:
-            data_obj = await run_research(
-                query=last_query,
-                depth=depth,
-                news=news,
-                sources=DEFAULT_SOURCES,
-                page=page,
-                search_engine=engine
-            )
-            
-            msg = format_results(data_obj)
-            await safe_edit_message(
-                query,
-                text=msg,
-                parse_mode=constants.ParseMode.HTML,
-                disable_web_page_preview=False,
-                reply_markup=build_keyboard(
-                    mode=mode,
-                    page=page,
-                    has_more=bool(data_obj.get('has_more')),
-                    engine=engine,
-                    context='results'
-                )
-            )
+            agent.close()
         except Exception as e:
-            logger.error(f"Pagination error: {e}")
-            await safe_edit_message(
-                query,
-                text=f"{EMOJI['error']} <b>Error loading page</b>\n\nPlease try again.",
-                parse_mode=constants.ParseMode.HTML,
-            )
+            logger.debug(f"Error closing agent: {e}")
+    _live_agents.clear()
+    _create_agent.cache_clear()
+    if _SHARED_SESSION is not None:
+        _SHARED_SESSION.close()
+
+
+async def on_startup(app) -> None:
+    """Start background maintenance once the application is initialized"""
+    global _eviction_task
+    _eviction_task = asyncio.create_task(evict_idle_users(app))
+
+
+async def on_shutdown(app) -> None:
+    """Release research threads and agent sessions once polling has stopped"""
+    if _eviction_task is not None:
+        _eviction_task.cancel()
+    stop_resources()
+    await asyncio.to_thread(close_agents)
 
 
 def main() -> None:
@@ -902,7 +1475,20 @@ def main() -> None:
         )
     
     # Build application
-    app = ApplicationBuilder().token(token).build()
+    # concurrent_updates lets one user's slow search not block everyone else
+    builder = (
+        ApplicationBuilder()
+        .token(token)
+        .concurrent_updates(True)
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+    )
+    if orjson is not None:
+        # Same pool sizes ApplicationBuilder would use by default
+        builder = builder.request(
+            OrjsonRequest(connection_pool_size=256)
+        ).get_updates_request(OrjsonRequest())
+    app = builder.build()
     
     # Register handlers
     app.add_handler(CommandHandler('start', cmd_start))
@@ -910,6 +1496,7 @@ def main() -> None:
     app.add_handler(CallbackQueryHandler(button_callback))
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text))
     
+    start_resources()
     logger.info(f"{EMOJI['rocket']} Bot started successfully!")
     
     try:
@@ -919,8 +1506,8 @@ def main() -> None:
     finally:
         # Cleanup
         logger.info("Cleaning up resources...")
-        _agent_cache.clear()
-        get_agent.cache_clear()
+        stop_resources()
+        close_agents()
 
 
 if __name__ == '__main__':
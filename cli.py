@@ -1,19 +1,38 @@
 """
 Command-line interface for AI Research Agent
 """
-import argparse
 import json
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.markdown import Markdown
-from research_agent import AIResearchAgent
+import sys
+from functools import lru_cache
+from types import SimpleNamespace
+from research_agent import AIResearchAgent, create_session, truncate
 
-console = Console()
+# Style definitions passed as style= rather than inline markup
+# (rich memoizes Style.parse, so each is parsed once per process)
+STYLE_ERROR = "bold red"
+STYLE_SECTION_RESULTS = "bold yellow"
+STYLE_SECTION_SOURCES = "bold green"
+STYLE_SECTION_ANALYSIS = "bold magenta"
+STYLE_TABLE_HEADER = "bold magenta"
+STYLE_BOLD = "bold"
+STYLE_DIM = "dim"
+STYLE_CYAN = "cyan"
+STYLE_BLUE = "blue"
+
+
+@lru_cache(maxsize=1)
+def get_console():
+    """Create the shared rich console on first use (rich is only imported when output starts)"""
+    from rich.console import Console
+    # highlight=False skips the per-print regex scan for numbers/URLs
+    return Console(highlight=False)
 
 
 def display_results(research_data: dict):
     """Display research results in a formatted way"""
+    from rich.panel import Panel
+    from rich.table import Table
+    console = get_console()
     
     # Header
     console.print(Panel(
@@ -23,30 +42,30 @@ def display_results(research_data: dict):
     ))
     
     if research_data.get('error'):
-        console.print(f"\n[bold red]⚠️ {research_data['error']}[/bold red]")
+        console.print(f"\n⚠️ {research_data['error']}", style=STYLE_ERROR, markup=False)
     
     # Search Results
     if research_data.get('search_results'):
-        console.print("\n[bold yellow]📊 Search Results:[/bold yellow]")
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("#", style="dim", width=3)
-        table.add_column("Title", style="cyan")
-        table.add_column("URL", style="blue")
+        console.print("\n📊 Search Results:", style=STYLE_SECTION_RESULTS)
+        table = Table(show_header=True, header_style=STYLE_TABLE_HEADER)
+        table.add_column("#", style=STYLE_DIM, width=3)
+        table.add_column("Title", style=STYLE_CYAN)
+        table.add_column("URL", style=STYLE_BLUE)
         
+        # Build all rows up front, then hand them to rich
+        rows = []
         for i, result in enumerate(research_data['search_results'], 1):
-            table.add_row(
-                str(i),
-                result['title'][:60] + "..." if len(result['title']) > 60 else result['title'],
-                result['url'][:50] + "..." if len(result['url']) > 50 else result['url']
-            )
+            rows.append((str(i), truncate(result['title'], 60), truncate(result['url'], 50)))
+        for row in rows:
+            table.add_row(*row)
         
         console.print(table)
     
     # Scraped Sources
     if research_data.get('sources'):
-        console.print(f"\n[bold green]📄 Scraped {len(research_data['sources'])} Sources:[/bold green]")
+        console.print(f"\n📄 Scraped {len(research_data['sources'])} Sources:", style=STYLE_SECTION_SOURCES)
         for i, source in enumerate(research_data['sources'], 1):
-            console.print(f"\n[bold]{i}. {source['title']}[/bold]")
+            console.print(f"\n{i}. {source['title']}", style=STYLE_BOLD, markup=False)
             console.print(f"   URL: [link]{source['url']}[/link]")
             if source.get('authors'):
                 console.print(f"   Authors: {', '.join(source['authors'])}")
@@ -54,17 +73,19 @@ def display_results(research_data: dict):
                 console.print(f"   Published: {source['publish_date']}")
             
             # Show excerpt
-            text = source.get('text', '')
-            excerpt = text[:300] + "..." if len(text) > 300 else text
-            console.print(f"   [dim]{excerpt}[/dim]")
+            excerpt = truncate(source.get('text') or '', 300)
+            console.print(f"   {excerpt}", style=STYLE_DIM, markup=False)
     
     # AI Analysis
     if research_data.get('analysis'):
-        console.print("\n[bold magenta]🤖 AI Analysis:[/bold magenta]")
+        console.print("\n🤖 AI Analysis:", style=STYLE_SECTION_ANALYSIS)
         console.print(Panel(research_data['analysis'], border_style="magenta"))
 
 
-def main():
+def build_parser():
+    """Build the full argument parser (used for anything beyond a bare query)"""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='AI Research Agent - Powerful internet research tool',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -120,12 +141,29 @@ Examples:
         help='Search for news articles instead of general web results'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    # Fast path: a single bare query needs none of argparse's machinery
+    if len(sys.argv) == 2 and not sys.argv[1].startswith('-'):
+        args = SimpleNamespace(
+            query=sys.argv[1],
+            depth='standard',
+            sources=5,
+            save=None,
+            ai_backend='ollama',
+            news=False
+        )
+    else:
+        args = build_parser().parse_args()
+    
+    console = get_console()
     
     # Initialize agent
     console.print("[bold green]🚀 Initializing AI Research Agent...[/bold green]")
     use_ai = args.ai_backend != 'none'
-    agent = AIResearchAgent(use_ai=use_ai, ai_backend=args.ai_backend)
+    agent = AIResearchAgent(use_ai=use_ai, ai_backend=args.ai_backend, session=create_session())
     
     # Conduct research
     try:
@@ -1,9 +1,22 @@
 """
 Example usage of AI Research Agent
 """
-from research_agent import AIResearchAgent
+from research_agent import AIResearchAgent, truncate
 import json
 
+try:
+    import orjson  # Optional: much faster JSON parsing
+except ImportError:
+    orjson = None
+
+try:
+    import ijson.backends.yajl2_c as ijson  # Optional: streaming parser, C backend
+except ImportError:
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
 
 def main():
     # Initialize the agent
@@ -37,7 +50,7 @@ def main():
     for i, source in enumerate(results2['sources'], 1):
         print(f"\n{i}. {source['title']}")
         print(f"   URL: {source['url']}")
-        text_preview = source['text'][:200] + "..." if len(source['text']) > 200 else source['text']
+        text_preview = truncate(source['text'], 200)
         print(f"   Preview: {text_preview}")
     
     # Example 3: Deep research with AI analysis (requires OpenAI API key)
@@ -62,9 +75,14 @@ def main():
     print("\n" + "="*60)
     print("LOADING SAVED RESEARCH")
     print("="*60)
-    with open(filename, 'r', encoding='utf-8') as f:
-        loaded_data = json.load(f)
-    print(f"Loaded {len(loaded_data)} research sessions")
+    with open(filename, 'rb') as f:
+        if ijson:
+            # Only the count is needed, so stream items instead of building them all
+            n_sessions = sum(1 for _ in ijson.items(f, 'item'))
+        else:
+            raw = f.read()
+            n_sessions = len(orjson.loads(raw) if orjson else json.loads(raw))
+    print(f"Loaded {n_sessions} research sessions")
 
 
 if __name__ == "__main__":
@@ -2,7 +2,10 @@
 PyQt6 GUI for AI Research Agent
 """
 import sys
-from typing import Dict, List
+from contextlib import contextmanager
+from functools import lru_cache
+from html import escape
+from typing import TYPE_CHECKING, Dict, List
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -17,18 +20,51 @@ from PyQt6.QtWidgets import (
     QCheckBox,
     QTextEdit,
     QTextBrowser,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QTabWidget,
     QFileDialog,
     QMessageBox,
     QMenu,
     QProgressDialog,
 )
-from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QSettings, QPoint
-from PyQt6.QtGui import QAction, QKeySequence
+from PyQt6.QtCore import (
+    Qt,
+    QObject,
+    QThread,
+    pyqtSignal,
+    QSettings,
+    QPoint,
+    QAbstractTableModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+    QTimer,
+)
+from PyQt6.QtGui import QKeySequence, QShortcut
+
+if TYPE_CHECKING:
+    import requests
+    from research_agent import AIResearchAgent
+
+
+# Every GUI run is recorded here, whichever cached agent performed it
+_HISTORY: List[Dict] = []
+
+
+@lru_cache(maxsize=1)
+def _get_session() -> "requests.Session":
+    # One keep-alive connection pool shared by every cached agent
+    from research_agent import create_session
+    return create_session()
+
 
-from research_agent import AIResearchAgent
+@lru_cache(maxsize=4)
+def _get_agent(use_ai: bool, backend: str) -> "AIResearchAgent":
+    # Reuse agents across runs so AI backends and HTTP clients stay warm.
+    # Imported lazily: research_agent pulls in heavy deps we don't need to paint the window.
+    from research_agent import AIResearchAgent
+    agent = AIResearchAgent(use_ai=use_ai, ai_backend=backend, session=_get_session())
+    agent.research_history = _HISTORY
+    return agent
 
 
 class ResearchWorker(QObject):
@@ -47,7 +83,7 @@ class ResearchWorker(QObject):
 
     def run(self):
         try:
-            agent = AIResearchAgent(use_ai=self.use_ai, ai_backend=self.ai_backend)
+            agent = _get_agent(self.use_ai, self.ai_backend)
             self.progress.emit(f"Researching: {self.query}")
             data = agent.research(
                 query=self.query,
@@ -61,6 +97,46 @@ class ResearchWorker(QObject):
             self.error.emit(str(e))
 
 
+@contextmanager
+def _frozen(widget: QWidget):
+    # Batch several model/document updates into a single repaint
+    widget.setUpdatesEnabled(False)
+    try:
+        yield widget
+    finally:
+        widget.setUpdatesEnabled(True)
+
+
+# Read-only table model over search results (no per-cell item objects)
+class ResultsModel(QAbstractTableModel):
+    HEADERS = ("#", "Title", "URL")
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._rows: List[tuple] = []
+
+    def set_results(self, results: List[Dict]):
+        self.beginResetModel()
+        self._rows = [(i, r.get("title", ""), r.get("url", "")) for i, r in enumerate(results, start=1)]
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self._rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -70,7 +146,6 @@ class MainWindow(QMainWindow):
         self.thread: QThread | None = None
         self.worker: ResearchWorker | None = None
         self.last_results: Dict | None = None
-        self.agent_for_save = AIResearchAgent(use_ai=False)  # for saving history if user wants
         self.progress_dlg: QProgressDialog | None = None
 
         central = QWidget()
@@ -115,16 +190,12 @@ class MainWindow(QMainWindow):
         self.save_btn.clicked.connect(self.on_save)
         controls.addWidget(self.save_btn)
 
-        # Shortcuts
-        self.action_save = QAction("Save", self)
-        self.action_save.setShortcut(QKeySequence.StandardKey.Save)
-        self.action_save.triggered.connect(self.on_save)
-        self.addAction(self.action_save)
+        # Shortcuts (window-wide; plain QShortcuts, no actions needed)
+        self.shortcut_save = QShortcut(QKeySequence.StandardKey.Save, self)
+        self.shortcut_save.activated.connect(self.on_save)
 
-        self.action_run = QAction("Run", self)
-        self.action_run.setShortcut(QKeySequence("Ctrl+R"))
-        self.action_run.triggered.connect(self.on_run)
-        self.addAction(self.action_run)
+        self.shortcut_run = QShortcut(QKeySequence("Ctrl+R"), self)
+        self.shortcut_run.activated.connect(self.on_run)
 
         # Status banner
         self.status_label = QLabel()
@@ -148,18 +219,26 @@ class MainWindow(QMainWindow):
 
         # Settings persistence
         self.settings = QSettings("AIResearch", "ResearchAgentGUI")
+        self.settings.setFallbacksEnabled(False)  # skip system-wide/org-wide lookups
         self.load_settings()
-
-        # Search Results tab
-        self.results_table = QTableWidget(0, 3)
-        self.results_table.setHorizontalHeaderLabels(["#", "Title", "URL"])
+        # Coalesce saves from rapid successive runs into one write
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self._do_save_settings)
+
+        # Search Results tab (model/view; the proxy handles column sorting)
+        self.results_model = ResultsModel(self)
+        self.results_proxy = QSortFilterProxyModel(self)
+        self.results_proxy.setSourceModel(self.results_model)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_proxy)
         self.results_table.horizontalHeader().setStretchLastSection(True)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.results_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         self.results_table.setAlternatingRowColors(True)
         self.results_table.setSortingEnabled(True)
         # Interactions: double-click opens URL, right-click context menu
-        self.results_table.cellDoubleClicked.connect(self.open_result_at_row)
+        self.results_table.doubleClicked.connect(lambda index: self.open_result_at_row(index.row()))
         self.results_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.results_table.customContextMenuRequested.connect(self.on_results_context_menu)
         self.tabs.addTab(self.results_table, "Search Results")
@@ -180,13 +259,31 @@ class MainWindow(QMainWindow):
         self.log_view = QTextEdit()
         self.log_view.setReadOnly(True)
         self.tabs.addTab(self.log_view, "Log")
+        # Buffer log lines and flush them at most ~10x/sec (one reflow per batch)
+        self._log_buf: List[str] = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush_log)
 
     def log(self, msg: str):
-        self.log_view.append(msg)
+        self._log_buf.append(msg)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(100)
+
+    def _flush_log(self):
+        if self._log_buf:
+            self.log_view.append("\n".join(self._log_buf))
+            self._log_buf.clear()
+
+    def clear_log(self):
+        self._flush_timer.stop()
+        self._log_buf.clear()
+        self.log_view.clear()
 
     def on_worker_progress(self, msg: str):
+        # Status bar is the per-message channel; the busy dialog is only opened/closed per run
         self.log(msg)
-        self.show_progress_dialog(msg)
+        self.statusBar().showMessage(msg)
 
     def show_progress_dialog(self, text: str):
         if self.progress_dlg is None:
@@ -216,10 +313,13 @@ class MainWindow(QMainWindow):
                 self.progress_dlg.deleteLater()
         finally:
             self.progress_dlg = None
+            self.statusBar().clearMessage()
 
     def closeEvent(self, event):
         try:
-            self.save_settings()
+            self._save_timer.stop()
+            self._do_save_settings()
+            self.settings.sync()
         finally:
             super().closeEvent(event)
 
@@ -252,10 +352,10 @@ class MainWindow(QMainWindow):
         # Disable UI while running
         self.run_btn.setEnabled(False)
         self.save_btn.setEnabled(False)
-        self.log_view.clear()
+        self.clear_log()
         self.analysis_view.clear()
         self.sources_view.clear()
-        self.results_table.setRowCount(0)
+        self.results_model.set_results([])
         self.log("Starting research...")
         self.set_status("Running research...", "info")
 
@@ -271,8 +371,8 @@ class MainWindow(QMainWindow):
         self.worker.finished.connect(self.worker.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
         self.thread.start()
-        # Save the current preferences
-        self.save_settings()
+        # Save the current preferences (debounced)
+        self._save_timer.start(500)
 
         # Show busy dialog
         self.show_progress_dialog("Starting research...")
@@ -287,7 +387,6 @@ class MainWindow(QMainWindow):
 
     def on_finished(self, data: Dict):
         self.last_results = data
-        self.agent_for_save.research_history.append(data)
         self.populate_results(data)
         if data.get("error"):
             self.log(f"Warning: {data['error']}")
@@ -302,51 +401,51 @@ class MainWindow(QMainWindow):
         self.save_btn.setEnabled(True)
 
     def populate_results(self, data: Dict):
-        # Populate search results table
-        results: List[Dict] = data.get("search_results", [])
-        # Faster table update: disable sorting/updates during population
-        prev_sorting = self.results_table.isSortingEnabled()
-        self.results_table.setSortingEnabled(False)
-        self.results_table.setUpdatesEnabled(False)
-        try:
-            self.results_table.setRowCount(len(results))
-            for i, r in enumerate(results, start=1):
-                self.results_table.setItem(i - 1, 0, QTableWidgetItem(str(i)))
-                self.results_table.setItem(i - 1, 1, QTableWidgetItem(r.get("title", "")))
-                self.results_table.setItem(i - 1, 2, QTableWidgetItem(r.get("url", "")))
-        finally:
-            self.results_table.setUpdatesEnabled(True)
-            self.results_table.setSortingEnabled(prev_sorting)
-
-        # Heuristic: If entries don't have news-specific fields, but user requested news,
-        # we likely fell back due to rate limiting. Inform the user in the log.
-        if results:
-            has_news_fields = any(("date" in r) or ("source" in r) for r in results)
-            if self.news_check.isChecked() and not has_news_fields:
-                self.log("Warning: News search may have been rate-limited; showing general web results instead.")
-                self.log("Tip: Try again in a bit or reduce 'Sources' to lessen requests.")
-                self.set_status("News rate-limited; showing general web results.", "warn")
-        else:
-            self.set_status("No results returned.", "warn")
-
-        # Populate sources view
-        sources: List[Dict] = data.get("sources", [])
-        parts = [
-            f"<b>{idx}. {s.get('title','')}</b><br>"
-            f"URL: <a href='{s.get('url','')}'>{s.get('url','')}</a><br>"
-            f"{'Authors: ' + ', '.join(s.get('authors', [])) + '<br>' if s.get('authors') else ''}"
-            f"{'Published: ' + s.get('publish_date') + '<br>' if s.get('publish_date') else ''}"
-            f"<i>{(s.get('text') or '')[:600]}{'...' if s.get('text') and len(s.get('text'))>600 else ''}</i>"
-            for idx, s in enumerate(sources, start=1)
-        ]
-        self.sources_view.setHtml("<br><br>".join(parts) if parts else "<i>No sources scraped.</i>")
-
-        # Populate analysis
-        analysis = data.get("analysis")
-        if analysis:
-            self.analysis_view.setPlainText(analysis)
-        else:
-            self.analysis_view.setPlainText("No analysis available.")
+        # Suspend repaints across the result tabs until all three are filled
+        with _frozen(self.tabs):
+            # Populate search results table
+            results: List[Dict] = data.get("search_results", [])
+            # Single model reset instead of per-cell item construction
+            self.results_model.set_results(results)
+
+            # Heuristic: If entries don't have news-specific fields, but user requested news,
+            # we likely fell back due to rate limiting. Inform the user in the log.
+            if results:
+                # Only scan the rows when news was requested
+                if self.news_check.isChecked() and not any("date" in r or "source" in r for r in results):
+                    self.log("Warning: News search may have been rate-limited; showing general web results instead.")
+                    self.log("Tip: Try again in a bit or reduce 'Sources' to lessen requests.")
+                    self.set_status("News rate-limited; showing general web results.", "warn")
+            else:
+                self.set_status("No results returned.", "warn")
+
+            # Populate sources view (research_agent is already loaded once results exist)
+            from research_agent import truncate
+            sources: List[Dict] = data.get("sources", [])
+            buf = []
+            for idx, s in enumerate(sources, start=1):
+                # Escape scraped values so stray markup can't break the layout
+                title = escape(s.get("title", ""))
+                url = escape(s.get("url", ""))
+                excerpt = escape(truncate(s.get("text") or "", 600))
+                authors = s.get("authors")
+                published = s.get("publish_date")
+                if buf:
+                    buf.append("<br><br>")
+                buf.append(f"<b>{idx}. {title}</b><br>URL: <a href='{url}'>{url}</a><br>")
+                if authors:
+                    buf.append(f"Authors: {escape(', '.join(authors))}<br>")
+                if published:
+                    buf.append(f"Published: {escape(published)}<br>")
+                buf.append(f"<i>{excerpt}</i>")
+            self.sources_view.setHtml("".join(buf) if buf else "<i>No sources scraped.</i>")
+
+            # Populate analysis
+            analysis = data.get("analysis")
+            if analysis:
+                self.analysis_view.setPlainText(analysis)
+            else:
+                self.analysis_view.setPlainText("No analysis available.")
 
         # Log header
         header = f"Query: {data.get('query','')}\nTimestamp: {data.get('timestamp','')}"
@@ -357,30 +456,35 @@ class MainWindow(QMainWindow):
                 self.log("Tip: DuckDuckGo may be throttling requests. Try again later or lower 'Sources'.")
 
     def on_save(self):
-        if not self.agent_for_save.research_history:
+        if not _HISTORY:
             QMessageBox.information(self, "Nothing to save", "Run a search first.")
             return
         file, _ = QFileDialog.getSaveFileName(self, "Save research JSON", "research.json", "JSON Files (*.json)")
         if not file:
             return
         try:
-            fname = self.agent_for_save.save_research(file)
+            # Any cached agent saves the shared history; this one does no research
+            fname = _get_agent(False, "none").save_research(file)
             QMessageBox.information(self, "Saved", f"Saved to {fname}")
         except Exception as e:
             QMessageBox.critical(self, "Save failed", str(e))
 
 
     def load_settings(self):
+        # One allKeys() pass; only keys that were actually saved are looked up
+        defaults = {"depth": "standard", "sources": 5, "backend": "ollama", "news": "false", "query": ""}
         try:
-            self.depth_combo.setCurrentText(self.settings.value("depth", "standard"))
-            self.sources_spin.setValue(int(self.settings.value("sources", 5)))
-            self.backend_combo.setCurrentText(self.settings.value("backend", "ollama"))
-            self.news_check.setChecked(self.settings.value("news", "false").lower() == "true")
-            self.query_edit.setText(self.settings.value("query", ""))
+            stored = {key: self.settings.value(key) for key in self.settings.allKeys() if key in defaults}
+            values = {**defaults, **stored}
+            self.depth_combo.setCurrentText(values["depth"])
+            self.sources_spin.setValue(int(values["sources"]))
+            self.backend_combo.setCurrentText(values["backend"])
+            self.news_check.setChecked(str(values["news"]).lower() == "true")
+            self.query_edit.setText(values["query"])
         except Exception:
             pass
 
-    def save_settings(self):
+    def _do_save_settings(self):
         try:
             self.settings.setValue("depth", self.depth_combo.currentText())
             self.settings.setValue("sources", self.sources_spin.value())
@@ -390,12 +494,16 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
+    def result_at_row(self, row: int) -> tuple:
+        # Row index is in view (sorted) order, so read through the proxy
+        title = self.results_proxy.index(row, 1).data() or ""
+        url = self.results_proxy.index(row, 2).data() or ""
+        return title, url
+
     def open_result_at_row(self, row: int, column: int = 0):
         try:
-            url_item = self.results_table.item(row, 2)
-            if not url_item:
-                return
-            url = url_item.text().strip()
+            _, url = self.result_at_row(row)
+            url = url.strip()
             if url:
                 import webbrowser
                 webbrowser.open(url)
@@ -408,11 +516,10 @@ class MainWindow(QMainWindow):
         copy_url_act = menu.addAction("Copy URL")
         copy_both_act = menu.addAction("Copy Title + URL")
         action = menu.exec(self.results_table.mapToGlobal(pos))
-        row = self.results_table.currentRow()
+        row = self.results_table.currentIndex().row()
         if row < 0:
             return
-        title = self.results_table.item(row, 1).text() if self.results_table.item(row, 1) else ""
-        url = self.results_table.item(row, 2).text() if self.results_table.item(row, 2) else ""
+        title, url = self.result_at_row(row)
         if action == open_act:
             self.open_result_at_row(row)
         elif action == copy_url_act:
@@ -2,109 +2,423 @@
 AI Research Agent - Powerful internet research tool with AI analysis
 """
 import os
+import re
+import codecs
 import json
 import random
-from typing import List, Dict, Optional, Callable
-from datetime import datetime
+import threading
+import weakref
+from collections import OrderedDict
+from typing import List, Dict, Optional, Callable, Iterator, Tuple
+import multiprocessing
+from concurrent.futures import BrokenExecutor, Executor, TimeoutError as FuturesTimeoutError, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from duckduckgo_search import DDGS
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.retry import Retry
 import time
 from newspaper import Article
 from dotenv import load_dotenv
 import logging
 
+try:
+    import orjson  # Optional: faster serialization for save_research
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+MAX_SCRAPE_WORKERS = 8  # Concurrent page downloads per research call
+SCRAPE_DEADLINE = 12.0  # Seconds a research call waits for all its pages before dropping stragglers
+SCRAPE_CACHE_SIZE = 512  # Successfully scraped pages kept per scraper
+SCRAPE_CACHE_TTL = 3600  # Seconds before a cached page is scraped again
+SEARCH_CACHE_SIZE = 64  # Search result lists kept per agent for paging through one query
+SEARCH_CACHE_TTL = 300  # Seconds a search result list is reused by later pages
+BAD_HOST_TTL = 600  # Seconds to skip a host after a connection to it failed
+# Links that never contain scrapeable HTML
+SKIP_EXTENSIONS = ('.pdf', '.zip', '.mp3', '.mp4', '.avi', '.doc', '.docx', '.ppt', '.pptx', '.exe')
+GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+GOOGLE_API_PREFIX = "https://www.googleapis.com/"
+RETRY_AFTER_CAP = 30  # Longest server-requested wait honoured before one inline retry
+ANALYSIS_PROGRESS_INTERVAL = 1.0  # Seconds between progress updates while the LLM streams
+
+_URL_SCHEME_RE = re.compile(r'^https?://', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+_CHARSET_PARAM_RE = re.compile(r'charset=["\']?\s*([A-Za-z0-9_:.-]+)', re.IGNORECASE)
+_XML_DECL_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?\s*([A-Za-z0-9_:.-]+)', re.IGNORECASE)
+
+# Stop downloading once this much HTML is in hand; extracted text is capped at 10KB anyway
+MAX_DOWNLOAD_BYTES = 256 * 1024
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Fallback extractor: main-content candidates in priority order (ignoring any inside boilerplate,
+# which the old extractor removed before searching), and visible text outside boilerplate
+_OUTSIDE_BOILERPLATE = '[not(ancestor::nav or ancestor::footer or ancestor::header or ancestor::aside)]'
+_MAIN_CONTENT_XPATHS = [
+    etree.XPath('//main' + _OUTSIDE_BOILERPLATE),
+    etree.XPath('//article' + _OUTSIDE_BOILERPLATE),
+    etree.XPath('//div[contains(concat(" ", normalize-space(@class), " "), " content ")]' + _OUTSIDE_BOILERPLATE),
+    etree.XPath('//body'),
+]
+_TEXT_XPATH = etree.XPath(
+    './/text()[not(ancestor::script or ancestor::style or ancestor::nav'
+    ' or ancestor::footer or ancestor::header or ancestor::aside)]'
+)
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+
+def create_session() -> requests.Session:
+    """Create a keep-alive HTTP session with the scraper's default headers and transient-error retries"""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    retries = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=False,  # a long Retry-After would stall a scrape worker
+        raise_on_status=False,  # hand the last response back to raise_for_status()
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # Google API 429s are not retried here: _search_google waits for the server's Retry-After instead
+    google_retries = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[500, 502, 503, 504],
+        respect_retry_after_header=False,  # otherwise urllib3 retries any 429 carrying Retry-After
+        raise_on_status=False,
+    )
+    session.mount(GOOGLE_API_PREFIX, HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=google_retries))
+    return session
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL for cache lookups: lowercase scheme/host, no fragment, no utm_* tracking params"""
+    parts = urlsplit(url)
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not k.lower().startswith('utm_')])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+def create_parse_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool for parse_page, for long-running hosts; spawn avoids forking a threaded process"""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with '...'"""
+    return text if len(text) <= limit else text[:limit] + '...'
+
+
+def _is_connect_failure(error: Exception) -> bool:
+    """True if no connection could be made (refused, DNS, connect timeout)
+    
+    requests reports read timeouts that exhausted the session's retries as a plain
+    ConnectionError too, so the underlying urllib3 reason decides.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    reason = getattr(error.args[0], 'reason', error.args[0])
+    # NewConnectionError and NameResolutionError subclass ConnectTimeoutError
+    return isinstance(reason, ConnectTimeoutError)
+
+
+def _detect_encoding(body: bytes, content_type: str) -> str:
+    """Charset named by the Content-Type header, else by a <meta> tag, else UTF-8
+    
+    requests reports ISO-8859-1 for text/html without a charset, which garbles UTF-8
+    pages that only declare it in <meta>, so its default is deliberately not used.
+    """
+    for match in (_CHARSET_PARAM_RE.search(content_type), _META_CHARSET_RE.search(body[:4096])):
+        if match:
+            name = match.group(1)
+            name = name.decode('ascii', 'replace') if isinstance(name, bytes) else name
+            try:
+                return codecs.lookup(name).name
+            except LookupError:
+                continue
+    return 'utf-8'
+
+
+def parse_page(url: str, body: bytes, encoding: Optional[str]) -> Dict:
+    """Extract title/text from downloaded HTML (newspaper first, lxml fallback)
+    
+    Pure CPU work with picklable inputs and outputs, so it can run in a process pool.
+    """
+    # Decode once in Python: codec names from _detect_encoding (e.g. euc_kr) aren't all known to libxml2
+    page_html = body.decode(encoding or 'utf-8', errors='replace')
+    try:
+        article = Article(url)
+        article.download(input_html=page_html)
+        article.parse()
+        
+        # Validate that we got meaningful content
+        if not article.text or len(article.text.strip()) < 50:
+            raise ValueError("Insufficient content extracted")
+        
+        return {
+            'url': url,
+            'title': article.title or 'Untitled',
+            'text': article.text[:10000],  # Limit to 10KB
+            'authors': article.authors,
+            'publish_date': str(article.publish_date) if article.publish_date else None,
+            'success': True
+        }
+    except Exception as e:
+        logging.debug(f"Article extraction failed for {url}: {e}")
+    
+    # Fallback to basic scraping of the already downloaded page
+    try:
+        # lxml rejects str input that still carries an <?xml encoding=...?> declaration
+        tree = lxml_html.document_fromstring(_XML_DECL_RE.sub('', page_html, count=1))
+        
+        # Try to find main content
+        main_content = tree
+        for find in _MAIN_CONTENT_XPATHS:
+            found = find(tree)
+            if found:
+                main_content = found[0]
+                break
+        
+        # Text nodes outside script, style, and other unwanted elements (selected in libxml2)
+        text = ' '.join(_TEXT_XPATH(main_content))
+        
+        # Clean up whitespace
+        text = _WS_RE.sub(' ', text).strip()
+        
+        if len(text.strip()) < 50:
+            raise ValueError("Insufficient content")
+        
+        return {
+            'url': url,
+            'title': (tree.findtext('.//title') or '').strip() or 'Untitled',
+            'text': text[:10000],  # Limit to 10KB
+            'success': True
+        }
+    except Exception as fallback_error:
+        logging.warning(f"Failed to scrape {url}: {fallback_error}")
+        return {
+            'url': url,
+            'error': str(fallback_error),
+            'success': False
+        }
+
 
 class WebScraper:
     """Enhanced web scraper for extracting content from URLs"""
     
-    def __init__(self, timeout: int = 10):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-        }
+    def __init__(
+        self,
+        timeout: int = 10,
+        session: Optional[requests.Session] = None,
+        parse_executor: Optional[Executor] = None,
+    ):
+        """
+        Args:
+            timeout: Per-request timeout in seconds
+            session: Shared session to reuse (not closed by close()); one is created if omitted
+            parse_executor: Executor (e.g. from create_parse_pool) that runs parse_page off the
+                scraping threads; pages are parsed in-thread when omitted
+        """
+        self.parse_executor = parse_executor
+        self.headers = dict(DEFAULT_HEADERS)
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self._owns_session = session is None
+        self.session = session or create_session()
+        # canonical URL -> (scraped_at, result); guarded by a lock since scrape_many runs in threads
+        self._cache: OrderedDict[str, Tuple[float, Dict]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # host -> monotonic time until which it is skipped after a connection failure
+        self._bad_hosts: Dict[str, float] = {}
+        self._bad_hosts_lock = threading.Lock()
+    
+    def _cache_get(self, key: str) -> Optional[Dict]:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > SCRAPE_CACHE_TTL:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return dict(entry[1])
+    
+    def _cache_put(self, key: str, result: Dict) -> None:
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), dict(result))
+            self._cache.move_to_end(key)
+            while len(self._cache) > SCRAPE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def _host_is_bad(self, host: str) -> bool:
+        with self._bad_hosts_lock:
+            until = self._bad_hosts.get(host)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._bad_hosts[host]
+                return False
+            return True
+    
+    def _mark_bad_host(self, host: str) -> None:
+        """Skip `host` for BAD_HOST_TTL, pruning expired entries so the map stays small"""
+        now = time.monotonic()
+        with self._bad_hosts_lock:
+            for stale in [h for h, until in self._bad_hosts.items() if until <= now]:
+                del self._bad_hosts[stale]
+            self._bad_hosts[host] = now + BAD_HOST_TTL
+    
+    def close(self) -> None:
+        """Close the pooled HTTP session if this scraper created it"""
+        if self._owns_session:
+            self.session.close()
+    
+    def _fetch(self, url: str) -> Tuple[bytes, str]:
+        """Stream an HTML page through the pooled session, stopping at MAX_DOWNLOAD_BYTES
+        
+        Returns the (possibly truncated) body and its encoding (header charset, <meta>, or UTF-8).
+        """
+        with self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True) as response:
+            response.raise_for_status()
+            content_type_header = response.headers.get('Content-Type', '')
+            content_type = content_type_header.split(';', 1)[0].strip().lower()
+            if content_type and content_type not in HTML_CONTENT_TYPES:
+                raise ValueError(f"Unsupported content type: {content_type}")
+            
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=16384):
+                body += chunk
+                if len(body) >= MAX_DOWNLOAD_BYTES:
+                    break
+            body = bytes(body[:MAX_DOWNLOAD_BYTES])
+            return body, _detect_encoding(body, content_type_header)
     
     def scrape_url(self, url: str) -> Dict:
-        """Scrape content from a URL with improved error handling"""
-        if not url or not url.startswith(('http://', 'https://')):
+        """Scrape content from a URL with improved error handling (successful results are cached)"""
+        if not url or not _URL_SCHEME_RE.match(url):
             return {'url': url, 'error': 'Invalid URL', 'success': False}
         
+        parts = urlsplit(url)
+        if parts.path.lower().endswith(SKIP_EXTENSIONS):
+            return {'url': url, 'error': 'Unsupported file type', 'success': False}
+        if self._host_is_bad(parts.netloc.lower()):
+            return {'url': url, 'error': 'Host recently unreachable', 'success': False}
+        
+        key = canonical_url(url)
+        cached = self._cache_get(key)
+        if cached is not None:
+            cached['url'] = url
+            return cached
+        
+        result = self._scrape_url_uncached(url)
+        if result.get('success'):
+            self._cache_put(key, result)
+        return result
+    
+    def _scrape_url_uncached(self, url: str) -> Dict:
+        """Download a page once, then extract it (in the parse pool when one is configured)"""
         try:
-            article = Article(url)
-            article.download()
-            article.parse()
-            
-            # Validate that we got meaningful content
-            if not article.text or len(article.text.strip()) < 50:
-                raise ValueError("Insufficient content extracted")
-            
-            return {
-                'url': url,
-                'title': article.title or 'Untitled',
-                'text': article.text[:10000],  # Limit to 10KB
-                'authors': article.authors,
-                'publish_date': str(article.publish_date) if article.publish_date else None,
-                'success': True
-            }
+            # Download through the pooled session; newspaper would open its own connection
+            body, encoding = self._fetch(url)
         except Exception as e:
-            logging.debug(f"Article extraction failed for {url}: {e}")
-            # Fallback to basic scraping
+            if _is_connect_failure(e):
+                # Unreachable host: don't spend connection slots on it for a while
+                self._mark_bad_host(urlsplit(url).netloc.lower())
+            logging.warning(f"Failed to scrape {url}: {e}")
+            return {'url': url, 'error': str(e), 'success': False}
+        
+        if self.parse_executor is not None:
             try:
-                response = self.session.get(url, timeout=self.timeout, allow_redirects=True)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'lxml')
-                
-                # Remove script, style, and other unwanted elements
-                for element in soup(["script", "style", "nav", "footer", "header", "aside"]):
-                    element.decompose()
-                
-                # Try to find main content
-                main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='content') or soup.body
-                if main_content:
-                    text = main_content.get_text(separator=' ', strip=True)
-                else:
-                    text = soup.get_text(separator=' ', strip=True)
-                
-                # Clean up whitespace
-                text = ' '.join(text.split())
-                
-                if len(text.strip()) < 50:
-                    raise ValueError("Insufficient content")
-                
-                return {
-                    'url': url,
-                    'title': soup.title.string if soup.title else 'Untitled',
-                    'text': text[:10000],  # Limit to 10KB
-                    'success': True
-                }
-            except Exception as fallback_error:
-                logging.warning(f"Failed to scrape {url}: {fallback_error}")
-                return {
-                    'url': url,
-                    'error': str(fallback_error),
-                    'success': False
-                }
+                return self.parse_executor.submit(parse_page, url, body, encoding).result()
+            except (BrokenExecutor, RuntimeError) as e:
+                # Pool crashed or was shut down (e.g. during exit): parse here instead
+                logging.warning(f"Parse pool unavailable, parsing in-thread: {e}")
+        return parse_page(url, body, encoding)
+    
+    def _scrape_or_error(self, url: str) -> Dict:
+        """scrape_url that reports unexpected exceptions as a failed result"""
+        try:
+            return self.scrape_url(url)
+        except Exception as e:
+            logging.error(f"Error scraping {url}: {e}")
+            return {'url': url, 'error': str(e), 'success': False}
+    
+    def scrape_many(self, urls: List[str], max_workers: int = MAX_SCRAPE_WORKERS,
+                    deadline: Optional[float] = SCRAPE_DEADLINE) -> Iterator[Tuple[int, Dict]]:
+        """
+        Scrape URLs concurrently (I/O bound), yielding (index, result) pairs as each finishes
+        
+        Pages still outstanding after `deadline` seconds are yielded as failed with error 'deadline';
+        their downloads are abandoned rather than waited for (None waits for every page).
+        """
+        if not urls:
+            return
+        workers = max(1, min(len(urls), max_workers))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scrape')
+        futures = {pool.submit(self._scrape_or_error, url): i for i, url in enumerate(urls)}
+        pending = set(futures)
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                pending.discard(future)
+                yield futures[future], future.result()
+        except FuturesTimeoutError:
+            logging.warning(f"Scrape deadline of {deadline}s hit, dropping {len(pending)} pages: "
+                            + ", ".join(urls[futures[f]] for f in pending))
+            for future in pending:
+                index = futures[future]
+                yield index, {'url': urls[index], 'error': 'deadline', 'success': False}
+        finally:
+            # Don't block on stragglers; their threads exit once the per-request timeout fires
+            pool.shutdown(wait=False, cancel_futures=True)
 
 
 class SearchEngine:
     """Web search engine using Google Custom Search API or DuckDuckGo fallback"""
     
-    def __init__(self, preferred_engine: str = "auto"):
+    def __init__(self, preferred_engine: str = "auto", session: Optional[requests.Session] = None):
         """
         Initialize search engine
         
         Args:
             preferred_engine: 'google', 'duckduckgo', or 'auto' (tries Google first, falls back to DuckDuckGo)
+            session: Shared session for Google API calls (not closed by close()); one is created if omitted
         """
+        self._owns_session = session is None
+        self.session = session or create_session()
         self._ua = (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
             "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
@@ -117,13 +431,65 @@ class SearchEngine:
         # Rotate between available backends to mitigate per-endpoint throttling
         self._backends_cycle = ["api", "html", "lite"]
         self._backend_idx = 0
-        self.ddgs = self._make_ddgs()
+        # backend -> monotonic time until which it is considered rate limited
+        self._backend_cooldown_until: Dict[str, float] = {}
+        # backend -> consecutive rate limits; sizes its next cooldown, cleared on success
+        self._backend_strikes: Dict[str, int] = {}
+        # One DDGS client per thread (created lazily) so its connection pool stays warm across searches
+        self._local = threading.local()
+        # Weak so a finished thread's client (e.g. one per GUI run) is freed with its thread-local
+        self._ddgs_clients: "weakref.WeakSet[DDGS]" = weakref.WeakSet()
+        self._ddgs_lock = threading.Lock()
     
     def set_preferred_engine(self, engine: str) -> None:
         """Set preferred search engine: 'google', 'duckduckgo', or 'auto'"""
-        self.preferred_engine = engine.lower()
+        engine = engine.lower()
+        if engine == self.preferred_engine:
+            return
+        self.preferred_engine = engine
         logging.info(f"Search engine preference set to: {self.preferred_engine}")
     
+    @property
+    def ddgs(self) -> DDGS:
+        """This thread's DDGS client"""
+        client = getattr(self._local, 'ddgs', None)
+        if client is None:
+            client = self._make_ddgs()
+            self._local.ddgs = client
+            with self._ddgs_lock:
+                self._ddgs_clients.add(client)
+        return client
+    
+    def _reset_ddgs(self) -> None:
+        """Drop this thread's DDGS client (after a rate limit/block) so the next call starts fresh"""
+        client = getattr(self._local, 'ddgs', None)
+        if client is None:
+            return
+        self._local.ddgs = None
+        with self._ddgs_lock:
+            self._ddgs_clients.discard(client)
+        self._close_ddgs(client)
+    
+    @staticmethod
+    def _close_ddgs(client: DDGS) -> None:
+        """Release a DDGS client's connections (best effort across versions)"""
+        close = getattr(client, 'close', None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logging.debug(f"Error closing DDGS client: {e}")
+    
+    def close(self) -> None:
+        """Release every DDGS client's connections and an owned session"""
+        with self._ddgs_lock:
+            clients = list(self._ddgs_clients)
+            self._ddgs_clients.clear()
+        for client in clients:
+            self._close_ddgs(client)
+        if self._owns_session:
+            self.session.close()
+    
     def _make_ddgs(self) -> DDGS:
         """Create a DDGS client with headers, optional proxies, and higher timeout."""
         proxies = {}
@@ -137,14 +503,49 @@ class SearchEngine:
         # timeout=20 to be a bit more lenient on slow responses
         return DDGS(headers=headers, proxies=proxies or None, timeout=20)
     
-    def _retry_backoff(self, attempt: int) -> None:
+    def _backoff_seconds(self, attempt: int) -> float:
         """Exponential backoff with jitter for rate limiting"""
         base = min(16, 2 ** attempt)  # Cap at 16 seconds instead of 32
         jitter = random.uniform(-0.5, 0.5)
-        sleep_time = max(1, base + jitter)
+        return max(1, base + jitter)
+    
+    def _retry_backoff(self, attempt: int) -> None:
+        """Sleep for the backoff delay of this attempt"""
+        sleep_time = self._backoff_seconds(attempt)
         logging.info(f"Rate limited, backing off for {sleep_time:.1f}s")
         time.sleep(sleep_time)
     
+    def _pick_backend(self) -> str:
+        """Next DuckDuckGo backend that is not cooling down; only waits when all of them are"""
+        now = time.monotonic()
+        n = len(self._backends_cycle)
+        for offset in range(n):
+            idx = (self._backend_idx + offset) % n
+            backend = self._backends_cycle[idx]
+            if self._backend_cooldown_until.get(backend, 0) <= now:
+                self._backend_idx = idx
+                return backend
+        
+        backend = min(self._backends_cycle, key=lambda b: self._backend_cooldown_until[b])
+        wait = self._backend_cooldown_until[backend] - now
+        logging.info(f"All DuckDuckGo backends rate limited, waiting {wait:.1f}s")
+        time.sleep(wait)
+        self._backend_idx = self._backends_cycle.index(backend)
+        return backend
+    
+    def _fetch_google_page(self, params: Dict) -> List[Dict]:
+        """Fetch one page of Custom Search results (raises on HTTP errors)"""
+        response = self.session.get(GOOGLE_SEARCH_URL, params=params, timeout=10)
+        response.raise_for_status()
+        return response.json().get('items', [])
+    
+    def _fetch_google_pages(self, page_params: List[Dict]) -> List[List[Dict]]:
+        """Fetch Custom Search pages concurrently, in page order"""
+        if len(page_params) == 1:
+            return [self._fetch_google_page(page_params[0])]
+        with ThreadPoolExecutor(max_workers=len(page_params), thread_name_prefix='google') as pool:
+            return list(pool.map(self._fetch_google_page, page_params))
+    
     def _search_google(self, query: str, max_results: int = 10) -> List[Dict]:
         """Search using Google Custom Search API with error handling"""
         if not self.google_api_key or not self.google_cse_id:
@@ -159,23 +560,29 @@ class SearchEngine:
             results = []
             # Google Custom Search API returns max 10 results per request
             num_requests = min((max_results + 9) // 10, 3)  # Limit to 3 requests max
-            
-            for i in range(num_requests):
-                start_index = i * 10 + 1
-                url = "https://www.googleapis.com/customsearch/v1"
-                params = {
+            # Page offsets are known up front, so request all pages at once
+            page_params = [
+                {
                     'key': self.google_api_key,
                     'cx': self.google_cse_id,
                     'q': query,
-                    'start': start_index,
-                    'num': min(10, max_results - len(results))
+                    'start': i * 10 + 1,
+                    'num': min(10, max_results - i * 10)
                 }
-                
-                response = requests.get(url, params=params, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                
-                items = data.get('items', [])
+                for i in range(num_requests)
+            ]
+            try:
+                pages = self._fetch_google_pages(page_params)
+            except requests.exceptions.HTTPError as e:
+                # Honour a short Retry-After on 429 with one inline retry; otherwise fall back as before
+                hint = _parse_retry_after(e.response.headers.get('Retry-After')) if e.response is not None else None
+                if e.response is None or e.response.status_code != 429 or hint is None or hint > RETRY_AFTER_CAP:
+                    raise
+                logging.info(f"Google API asked to retry after {hint:.1f}s")
+                time.sleep(hint)
+                pages = self._fetch_google_pages(page_params)
+            
+            for items in pages:
                 if not items:
                     break
                     
@@ -238,8 +645,8 @@ class SearchEngine:
         max_results = max(1, min(max_results, 20))
         last_error: Optional[Exception] = None
         for attempt in range(5):
+            backend = self._pick_backend()
             try:
-                backend = self._backends_cycle[self._backend_idx % len(self._backends_cycle)]
                 results_raw = self.ddgs.text(
                     query,
                     max_results=max_results,
@@ -254,27 +661,31 @@ class SearchEngine:
                         'url': r.get('href', '') or r.get('url', ''),
                         'snippet': r.get('body', '') or r.get('snippet', ''),
                     })
+                self._backend_strikes.pop(backend, None)
                 return results
             except DuckDuckGoSearchException as e:
                 last_error = e
-                # If it's a rate limit, backoff and recreate the client
+                # If it's a rate limit, cool this backend down and move straight on to the next one
                 if "Ratelimit" in str(e) or "429" in str(e):
-                    # Switch backend to try a different endpoint
+                    strikes = self._backend_strikes.get(backend, 0)
+                    self._backend_strikes[backend] = strikes + 1
+                    cooldown = self._backoff_seconds(strikes)
+                    self._backend_cooldown_until[backend] = time.monotonic() + cooldown
+                    logging.info(f"DuckDuckGo '{backend}' backend rate limited, cooling down for {cooldown:.1f}s")
                     self._backend_idx = (self._backend_idx + 1) % len(self._backends_cycle)
-                    self.ddgs = self._make_ddgs()
+                    self._reset_ddgs()
                     if attempt < 4:
-                        self._retry_backoff(attempt)
                         continue
-                # Non-rate-limit DDG errors: recreate once and retry
-                self.ddgs = self._make_ddgs()
+                # Blocked: start over with a fresh client; other DDG errors keep the warm one
+                if "403" in str(e):
+                    self._reset_ddgs()
                 if attempt < 4:
                     time.sleep(1)  # Shorter backoff for non-rate-limit errors
                     continue
             except Exception as e:
                 last_error = e
                 logging.debug(f"Search attempt {attempt + 1} failed: {e}")
-                # Generic network error: recreate and retry
-                self.ddgs = self._make_ddgs()
+                # Generic network error: keep the client and retry
                 if attempt < 4:
                     time.sleep(1)
                     continue
@@ -307,19 +718,14 @@ class SearchEngine:
                 return results
             except DuckDuckGoSearchException as e:
                 last_error = e
-                if "Ratelimit" in str(e) or "429" in str(e):
-                    # Try switching text backend as a fallback if news keeps failing
-                    self.ddgs = self._make_ddgs()
-                    if attempt < 4:
-                        self._retry_backoff(attempt)
-                        continue
-                self.ddgs = self._make_ddgs()
+                if "Ratelimit" in str(e) or "429" in str(e) or "403" in str(e):
+                    # Rate limited or blocked: retry with a fresh client
+                    self._reset_ddgs()
                 if attempt < 4:
                     self._retry_backoff(attempt)
                     continue
             except Exception as e:
                 last_error = e
-                self.ddgs = self._make_ddgs()
                 if attempt < 4:
                     self._retry_backoff(attempt)
                     continue
@@ -337,17 +743,61 @@ class SearchEngine:
 class AIResearchAgent:
     """Main AI research agent coordinating search and analysis"""
     
-    def __init__(self, use_ai: bool = True, ai_backend: str = 'ollama', search_engine: str = 'auto'):
-        self.search_engine = SearchEngine(preferred_engine=search_engine)
-        self.scraper = WebScraper()
+    # Summarization pipeline shared by all agents; loading BART is the dominant cost
+    _summarizer = None
+    _summarizer_lock = threading.Lock()
+    
+    def __init__(
+        self,
+        use_ai: bool = True,
+        ai_backend: str = 'ollama',
+        search_engine: str = 'auto',
+        session: Optional[requests.Session] = None,
+        parse_executor: Optional[Executor] = None,
+    ):
+        self.scraper = WebScraper(session=session, parse_executor=parse_executor)
+        # One connection pool for scraping and Google API calls
+        self.search_engine = SearchEngine(preferred_engine=search_engine, session=self.scraper.session)
         self.use_ai = use_ai
         self.ai_backend = ai_backend  # 'ollama' or 'transformers'
         self.research_history = []
+        # (query, news, engine) -> (searched_at, requested count, results); later pages reuse the search
+        self._search_cache: OrderedDict[Tuple[str, bool, str], Tuple[float, int, List[Dict]]] = OrderedDict()
+        self._search_cache_lock = threading.Lock()
     
     def set_search_engine(self, engine: str) -> None:
         """Set preferred search engine: 'google', 'duckduckgo', or 'auto'"""
         self.search_engine.set_preferred_engine(engine)
     
+    def close(self) -> None:
+        """Close network clients held by the scraper and search engine"""
+        self.scraper.close()
+        self.search_engine.close()
+    
+    def _search(self, query: str, news: bool, max_results: int) -> List[Dict]:
+        """Web or news search, reusing a recent result list for the same query that was at least as long"""
+        key = (query, news, self.search_engine.preferred_engine)
+        now = time.monotonic()
+        with self._search_cache_lock:
+            entry = self._search_cache.get(key)
+            if entry is not None and now - entry[0] <= SEARCH_CACHE_TTL and entry[1] >= max_results:
+                self._search_cache.move_to_end(key)
+                logging.info(f"Reusing {len(entry[2])} search results for: {query}")
+                return list(entry[2])
+        
+        if news:
+            results = self.search_engine.news_search(query, max_results=max_results)
+        else:
+            results = self.search_engine.search(query, max_results=max_results)
+        
+        if results:
+            with self._search_cache_lock:
+                self._search_cache[key] = (now, max_results, list(results))
+                self._search_cache.move_to_end(key)
+                while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+        return results
+    
     def research(
         self,
         query: str,
@@ -386,10 +836,7 @@ class AIResearchAgent:
         print("📡 " + step_msg)
         if progress_cb:
             progress_cb(step_msg)
-        if news:
-            all_results = self.search_engine.news_search(query, max_results=fetch_n)
-        else:
-            all_results = self.search_engine.search(query, max_results=fetch_n)
+        all_results = self._search(query, news, fetch_n)
         
         page_results = all_results[start:start + per_page] if all_results else []
         # has_more true if there are results beyond the current page slice
@@ -412,44 +859,47 @@ class AIResearchAgent:
         
         if depth in ['standard', 'deep']:
             # Step 2: Scrape sources for the current page only
-            msg = f"Scraping {len(page_results)} sources..."
+            # Scrape each distinct page once even if the results list it twice
+            unique_urls: Dict[str, str] = {}
+            for result in page_results:
+                url = result.get('url', '')
+                unique_urls.setdefault(canonical_url(url), url)
+            urls = list(unique_urls.values())
+            
+            msg = f"Scraping {len(urls)} sources..."
             print(f"📄 {msg}")
             if progress_cb:
                 progress_cb(msg)
             
-            successful_scrapes = 0
-            for i, result in enumerate(page_results, 1):
-                url = result.get('url', '')
-                prog = f"Scraping [{i}/{len(page_results)}] {url}"
-                print(f"  [{i}/{len(page_results)}] {url}")
+            # Filled by original position so sources keep the search ranking order
+            scraped_by_index: List[Optional[Dict]] = [None] * len(urls)
+            for done, (index, scraped) in enumerate(self.scraper.scrape_many(urls), 1):
+                url = urls[index]
+                prog = f"Scraped [{done}/{len(urls)}] {url}"
+                print(f"  [{done}/{len(urls)}] {url}")
                 if progress_cb:
                     progress_cb(prog)
-                
-                try:
-                    scraped = self.scraper.scrape_url(url)
-                    if scraped.get('success'):
-                        research_data['sources'].append(scraped)
-                        successful_scrapes += 1
-                except Exception as e:
-                    logging.error(f"Error scraping {url}: {e}")
+                scraped_by_index[index] = scraped
             
-            logging.info(f"Successfully scraped {successful_scrapes}/{len(page_results)} sources")
+            research_data['sources'] = [s for s in scraped_by_index if s.get('success')]
+            successful_scrapes = len(research_data['sources'])
+            logging.info(f"Successfully scraped {successful_scrapes}/{len(urls)} sources")
         
         if depth == 'deep' and self.use_ai:
             # Step 3: AI analysis with local models
             print(f"🤖 Analyzing with {self.ai_backend}...")
             if progress_cb:
                 progress_cb(f"Analyzing with {self.ai_backend}...")
-            research_data['analysis'] = self._analyze_with_ai(research_data)
+            research_data['analysis'] = self._analyze_with_ai(research_data, progress_cb)
         
         self.research_history.append(research_data)
         return research_data
     
-    def _analyze_with_ai(self, research_data: Dict) -> str:
+    def _analyze_with_ai(self, research_data: Dict, progress_cb: Optional[Callable[[str], None]] = None) -> str:
         """Analyze research data with local AI (Ollama or Transformers)"""
         try:
             # Try Ollama first (faster, requires Ollama installed)
-            return self._analyze_with_ollama(research_data)
+            return self._analyze_with_ollama(research_data, progress_cb)
         except Exception as e1:
             try:
                 # Fallback to Hugging Face transformers
@@ -457,16 +907,17 @@ class AIResearchAgent:
             except Exception as e2:
                 return f"AI analysis unavailable. Install Ollama or use transformers. Errors: {e1}, {e2}"
     
-    def _analyze_with_ollama(self, research_data: Dict) -> str:
-        """Analyze using Ollama (local LLM)"""
+    def _analyze_with_ollama(self, research_data: Dict, progress_cb: Optional[Callable[[str], None]] = None) -> str:
+        """Analyze using Ollama (local LLM), streaming the response"""
         import ollama
         
-        # Prepare context from sources
-        context = f"Research Query: {research_data['query']}\n\n"
-        context += "Sources:\n"
-        for i, source in enumerate(research_data['sources'], 1):
-            context += f"\n{i}. {source['title']}\n"
-            context += f"{source['text'][:800]}...\n"
+        # Prepare context from sources (joined once instead of repeated +=)
+        parts = [f"Research Query: {research_data['query']}\n\n", "Sources:\n"]
+        parts.extend(
+            f"\n{i}. {source['title']}\n{source['text'][:800]}...\n"
+            for i, source in enumerate(research_data['sources'], 1)
+        )
+        context = ''.join(parts)
         
         prompt = f"""{context}
 
@@ -478,28 +929,60 @@ Based on the above sources, provide a comprehensive research summary that:
 
 Summary:"""
         
-        response = ollama.generate(
+        stream = ollama.generate(
             model='llama2',  # or 'mistral', 'phi', etc.
-            prompt=prompt
+            prompt=prompt,
+            stream=True
         )
         
-        return response['response']
+        # Collect tokens as they arrive; report progress at a steady rate rather than per token
+        out: List[str] = []
+        last_report = time.monotonic()
+        for chunk in stream:
+            out.append(chunk['response'])
+            if progress_cb and time.monotonic() - last_report >= ANALYSIS_PROGRESS_INTERVAL:
+                last_report = time.monotonic()
+                progress_cb(f"Analyzing with ollama... {len(out)} tokens generated")
+        
+        return ''.join(out)
+    
+    @classmethod
+    def _get_summarizer(cls):
+        """Load the summarization pipeline once per process (fp16 on GPU, default precision on CPU)"""
+        if cls._summarizer is None:
+            with cls._summarizer_lock:
+                if cls._summarizer is None:
+                    import torch
+                    from transformers import pipeline
+                    if torch.cuda.is_available():
+                        cls._summarizer = pipeline(
+                            "summarization",
+                            model="facebook/bart-large-cnn",
+                            device=0,
+                            torch_dtype=torch.float16,
+                        )
+                    else:
+                        cls._summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+        return cls._summarizer
     
     def _analyze_with_transformers(self, research_data: Dict) -> str:
         """Analyze using Hugging Face transformers (fallback)"""
-        from transformers import pipeline
-        
         # Use summarization pipeline
-        summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+        summarizer = self._get_summarizer()
         
-        # Combine all source texts
-        full_text = f"Research on: {research_data['query']}\n\n"
-        for source in research_data['sources']:
-            full_text += f"{source['title']}: {source['text'][:500]}... "
+        # Map: up to two ~3500-char windows per source (under BART's 1024-token limit), one batched call
+        chunks = [
+            source['text'][i:i + 3500]
+            for source in research_data['sources']
+            for i in range(0, min(len(source['text']), 7000), 3500)
+        ]
+        if not chunks:
+            chunks = [f"Research on: {research_data['query']}"]
+        summaries = summarizer(chunks, max_length=120, min_length=40, do_sample=False, batch_size=8, truncation=True)
         
-        # Summarize (BART has max length limits)
-        text_chunk = full_text[:1024]
-        summary = summarizer(text_chunk, max_length=300, min_length=100, do_sample=False)
+        # Reduce: summarize the per-chunk summaries into the final analysis
+        combined = " ".join(s['summary_text'] for s in summaries)
+        summary = summarizer(combined, max_length=300, min_length=100, do_sample=False, truncation=True)
         
         return summary[0]['summary_text']
     
@@ -508,8 +991,19 @@ Summary:"""
         if not filename:
             filename = f"research_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.research_history, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            # orjson emits UTF-8 bytes directly (same output as ensure_ascii=False).
+            # Entries are written one at a time so only one is serialized in memory at once.
+            option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            with open(filename, 'wb') as f:
+                f.write(b'[')
+                for i, entry in enumerate(self.research_history):
+                    f.write(b',\n' if i else b'\n')
+                    f.write(orjson.dumps(entry, option=option))
+                f.write(b'\n]' if self.research_history else b']')
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(self.research_history, f, indent=2, ensure_ascii=False)
         
         print(f"✅ Research saved to {filename}")
         return filename